@@ -1,6 +1,26 @@
 # Baseline ReAct Agent - LangChain + Ollama
-from .agent import ReactAgent
+import os
+import sys
+from typing import TYPE_CHECKING
+
+# Read-only installs can't write __pycache__ next to the sources, so every
+# start would recompile; keep bytecode in a user cache instead. Set before
+# the submodules below are imported so they are cached too.
+if sys.pycache_prefix is None and not os.access(os.path.dirname(__file__), os.W_OK):
+    sys.pycache_prefix = os.path.expanduser("~/.cache/leap/pyc")
+
 from .config import AgentConfig
 
+if TYPE_CHECKING:
+    from .agent import ReactAgent
+
 __all__ = ["ReactAgent", "AgentConfig"]
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str):
+    # ReactAgent pulls in LangChain/LangGraph, so it is imported on first use
+    if name == "ReactAgent":
+        from .agent import ReactAgent
+        return ReactAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
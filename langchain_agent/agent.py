@@ -1,12 +1,36 @@
 """Main ReAct Agent using LangChain with LangChain-Ollama for inference."""
+from collections import OrderedDict, deque
 from typing import Optional, Generator
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langgraph.prebuilt import create_react_agent
 
 from .config import AgentConfig
 from .llm import create_llm
 from .prompts import SYSTEM_PROMPT
-from .tools import ALL_TOOLS
+
+
+# Compiled ReAct graphs keyed by (LLM identity, tool names). The cache holds a
+# reference to each LLM, so an id() cannot be reused while its entry is alive.
+_AGENT_CACHE_SIZE = 8
+_agent_cache: OrderedDict = OrderedDict()
+
+
+def _get_react_agent(llm, tools: list):
+    """Return a compiled ReAct graph, reusing one built for the same LLM and tools."""
+    key = (id(llm), tuple(t.name for t in tools))
+    agent = _agent_cache.get(key)
+    if agent is None:
+        agent = create_react_agent(
+            model=llm,
+            tools=tools,
+            prompt=SYSTEM_PROMPT,
+        )
+        _agent_cache[key] = agent
+        if len(_agent_cache) > _AGENT_CACHE_SIZE:
+            _agent_cache.popitem(last=False)
+    else:
+        _agent_cache.move_to_end(key)
+    return agent
 
 
 class ReactAgent:
@@ -17,32 +41,29 @@ class ReactAgent:
         self.config = config or AgentConfig()
         self.llm = create_llm(self.config)
         self.tools = self._get_enabled_tools()
-        self.history: list = []
+        self.history: deque = deque(maxlen=self.config.max_history)
         
         # Create the ReAct agent with tools bound to LLM
-        self.agent = create_react_agent(
-            model=self.llm,
-            tools=self.tools,
-            prompt=SYSTEM_PROMPT,
-        )
+        self.agent = _get_react_agent(self.llm, self.tools)
         
     def _get_enabled_tools(self) -> list:
         """Get tools based on configuration."""
-        from .tools import FILE_TOOLS, SHELL_TOOLS, WEB_TOOLS, CODE_TOOLS, UTILITY_TOOLS, CRAWL_TOOLS
+        from . import tools as registry
         
+        # Only enabled groups are imported
         tools = []
         if self.config.enable_file_tools:
-            tools.extend(FILE_TOOLS)
+            tools.extend(registry.FILE_TOOLS)
         if self.config.enable_shell_tools:
-            tools.extend(SHELL_TOOLS)
+            tools.extend(registry.SHELL_TOOLS)
         if self.config.enable_web_tools:
-            tools.extend(WEB_TOOLS)
+            tools.extend(registry.WEB_TOOLS)
         if self.config.enable_code_tools:
-            tools.extend(CODE_TOOLS)
+            tools.extend(registry.CODE_TOOLS)
         if self.config.enable_utility_tools:
-            tools.extend(UTILITY_TOOLS)
+            tools.extend(registry.UTILITY_TOOLS)
         if self.config.enable_crawl_tools:
-            tools.extend(CRAWL_TOOLS)
+            tools.extend(registry.CRAWL_TOOLS)
         return tools
     
     def run(self, user_input: str) -> str:
@@ -54,62 +75,83 @@ class ReactAgent:
         Returns:
             The agent's final response
         """
-        self.history.append(HumanMessage(content=user_input))
+        if self.config.one_shot:
+            return self._run_once(user_input)
+        
+        self._remember([HumanMessage(content=user_input)])
         
         result = self.agent.invoke({
-            "messages": self.history,
+            "messages": list(self.history),
         })
         
         messages = result.get("messages", [])
         if messages:
             last_message = messages[-1]
             response = last_message.content if hasattr(last_message, 'content') else str(last_message)
-            self.history = messages
+            self.history.clear()
+            self._remember(messages[-self.config.max_history:])
             return response
         
         return "No response generated."
     
+    def _run_once(self, user_input: str) -> str:
+        """Answer a standalone request, returning at the first final answer.
+        
+        History is neither read nor kept. The graph is streamed so the reply
+        is returned as soon as the model answers without calling a tool,
+        without assembling the final graph state.
+        """
+        for event in self.agent.stream({"messages": [HumanMessage(content=user_input)]}):
+            for msg in event.get("agent", {}).get("messages", []):
+                if isinstance(msg, AIMessage) and not msg.tool_calls:
+                    return msg.content
+        
+        return "No response generated."
+    
     def run_streaming(self, user_input: str) -> Generator[str, None, None]:
         """Run the agent with streaming output."""
-        self.history.append(HumanMessage(content=user_input))
+        self._remember([HumanMessage(content=user_input)])
         
-        last_content = ""
-        final_messages = self.history.copy()
+        sent = 0  # characters of the current message already yielded
+        new_messages = []
         
-        for event in self.agent.stream({"messages": self.history}):
+        for event in self.agent.stream({"messages": list(self.history)}):
             if "agent" in event:
                 messages = event["agent"].get("messages", [])
                 for msg in messages:
-                    if hasattr(msg, 'content') and msg.content:
-                        new_content = msg.content[len(last_content):]
-                        if new_content:
-                            yield new_content
-                            last_content = msg.content
-                final_messages = event["agent"].get("messages", final_messages)
+                    content = getattr(msg, 'content', None)
+                    if content and len(content) > sent:
+                        yield content[sent:]
+                        sent = len(content)
+                new_messages.extend(messages)
             
             if "tools" in event:
                 messages = event["tools"].get("messages", [])
+                new_messages.extend(messages)
                 for msg in messages:
                     if hasattr(msg, 'content'):
                         content = str(msg.content)
                         yield f"\n\n[TOOL] Tool result:\n```\n{content[:500]}{'...' if len(content) > 500 else ''}\n```\n\n"
-                        last_content = ""
+                        sent = 0
         
-        self.history = final_messages
+        self._remember(new_messages)
+    
+    def _remember(self, messages: list):
+        """Append messages to the bounded history window."""
+        self.history.extend(messages)
+        # Don't start the window on a tool result whose tool call was evicted
+        while self.history and isinstance(self.history[0], ToolMessage):
+            self.history.popleft()
     
     def clear_history(self):
         """Clear conversation history."""
-        self.history = []
+        self.history.clear()
     
     def set_model(self, model: str):
         """Change the Ollama model."""
         self.config.model = model
         self.llm = create_llm(self.config)
-        self.agent = create_react_agent(
-            model=self.llm,
-            tools=self.tools,
-            prompt=SYSTEM_PROMPT,
-        )
+        self.agent = _get_react_agent(self.llm, self.tools)
     
     def get_available_tools(self) -> list[str]:
         """Get list of available tool names."""
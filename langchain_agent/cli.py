@@ -1,10 +1,22 @@
 """Interactive CLI for the ReAct Agent."""
 import sys
+import json
+import time
 import readline
+import contextlib
 from typing import Optional
 
 from .agent import ReactAgent
-from .config import AgentConfig, AVAILABLE_MODELS
+from .config import AgentConfig, AVAILABLE_MODELS, AVAILABLE_MODELS_SET
+
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+except ImportError:
+    # Fall back to input() + GNU readline
+    PromptSession = None
+
+HISTORY_FILE = ".react_agent_history"
 
 
 class Colors:
@@ -54,6 +66,24 @@ Commands:
     print_colored(help_text, Colors.YELLOW)
 
 
+def _make_line_reader():
+    """Return a callable that reads one line of user input.
+
+    Uses a prompt_toolkit session when available, which appends each entry
+    to the history file as it is submitted; otherwise loads readline history
+    for plain input().
+    """
+    if PromptSession is not None:
+        session = PromptSession(history=FileHistory(HISTORY_FILE))
+        return lambda: session.prompt("")
+    
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except FileNotFoundError:
+        pass
+    return input
+
+
 def run_cli(config: Optional[AgentConfig] = None):
     config = config or AgentConfig()
     agent = ReactAgent(config)
@@ -62,10 +92,7 @@ def run_cli(config: Optional[AgentConfig] = None):
     print_colored(f"  Model: {config.model} | Tools: {len(agent.tools)}", Colors.DIM)
     print()
     
-    try:
-        readline.read_history_file(".react_agent_history")
-    except FileNotFoundError:
-        pass
+    read_line = _make_line_reader()
     
     while True:
         try:
@@ -73,7 +100,7 @@ def run_cli(config: Optional[AgentConfig] = None):
             
             lines = []
             while True:
-                line = input()
+                line = read_line()
                 if line.endswith("\\"):
                     lines.append(line[:-1])
                 else:
@@ -103,7 +130,9 @@ def run_cli(config: Optional[AgentConfig] = None):
                         marker = "  → " if m == config.model else "    "
                         print(f"{marker}{m}")
                 elif cmd == "/model":
-                    if args:
+                    if args and args[0] not in AVAILABLE_MODELS_SET:
+                        print_colored(f"Unknown model: {args[0]} (see /models)", Colors.RED)
+                    elif args:
                         agent.set_model(args[0])
                         print_colored(f"Switched to: {args[0]}", Colors.GREEN)
                     else:
@@ -137,10 +166,68 @@ def run_cli(config: Optional[AgentConfig] = None):
             print_colored("\nGoodbye! [EXIT]", Colors.CYAN)
             break
     
-    try:
-        readline.write_history_file(".react_agent_history")
-    except:
-        pass
+    if PromptSession is None:
+        try:
+            readline.write_history_file(HISTORY_FILE)
+        except:
+            pass
+
+
+def _answer_lines(agent: ReactAgent, lines, out):
+    """Answer JSON-line ``{"task": ...}`` requests, writing one JSON reply per line."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        
+        start = time.perf_counter()
+        try:
+            task = json.loads(line)["task"]
+            agent.clear_history()
+            with contextlib.redirect_stdout(sys.stderr):
+                response = agent.run(task)
+            reply = {"task": task, "response": response, "success": True}
+        except Exception as e:
+            reply = {"error": str(e), "success": False}
+        reply["elapsed"] = time.perf_counter() - start
+        
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+
+
+def run_server(config: Optional[AgentConfig] = None):
+    """Serve tasks over stdin/stdout as JSON lines.
+
+    Each input line is ``{"task": "..."}``; each reply is one JSON line with
+    the response and elapsed time. Agent output is redirected to stderr so
+    stdout only carries replies.
+    """
+    config = config or AgentConfig(streaming=False, verbose=False)
+    out = sys.stdout
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        agent = ReactAgent(config)
+    
+    _answer_lines(agent, sys.stdin, out)
+
+
+def run_batch(tasks_path: str, out_path: Optional[str] = None, config: Optional[AgentConfig] = None):
+    """Run every task in a JSON-lines file with a single agent.
+
+    Results are written as JSON lines to ``out_path`` (stdout if omitted).
+    """
+    config = config or AgentConfig(streaming=False, verbose=False)
+    out = sys.stdout
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        agent = ReactAgent(config)
+    
+    with open(tasks_path, 'r', encoding='utf-8') as tasks:
+        if out_path:
+            with open(out_path, 'w', encoding='utf-8') as f:
+                _answer_lines(agent, tasks, f)
+        else:
+            _answer_lines(agent, tasks, out)
 
 
 if __name__ == "__main__":
@@ -32,10 +32,13 @@ class AgentConfig:
     # Output settings
     streaming: bool = True
     verbose: bool = True
+    
+    # Answer a single standalone request (no history), e.g. for --command
+    one_shot: bool = False
 
 
 # Available Ollama models
-AVAILABLE_MODELS = [
+AVAILABLE_MODELS = (
     "qwen3:4b",
     "qwen3:1.7b", 
     "qwen3:0.6b",
@@ -47,4 +50,5 @@ AVAILABLE_MODELS = [
     "ministral-3:3b",
     "gpt-oss:20b",
     "functiongemma:latest",
-]
+)
+AVAILABLE_MODELS_SET = frozenset(AVAILABLE_MODELS)
@@ -1,17 +1,38 @@
 """LLM wrapper for Ollama integration via LangChain."""
+import functools
+
+from ollama import Client
 from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from .config import AgentConfig
 
 
-def create_llm(config: AgentConfig) -> ChatOllama:
-    """Create a ChatOllama instance with the given configuration."""
-    return ChatOllama(
-        model=config.model,
-        temperature=config.temperature,
-        base_url=config.base_url,
-        num_predict=config.max_tokens,
+@functools.lru_cache(maxsize=None)
+def _shared_client(base_url: str) -> Client:
+    """One keep-alive HTTP client per Ollama server, shared by every ChatOllama."""
+    return Client(host=base_url)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_llm(model: str, temperature: float, base_url: str, num_predict: int) -> ChatOllama:
+    """Build a ChatOllama once per distinct set of settings."""
+    llm = ChatOllama(
+        model=model,
+        temperature=temperature,
+        base_url=base_url,
+        num_predict=num_predict,
     )
+    # ChatOllama opens its own client per instance; point the sync path at the
+    # shared one so model switches reuse the open socket. URLs carrying
+    # credentials keep their own client, which has the auth headers set.
+    if "@" not in base_url:
+        llm._client = _shared_client(base_url)
+    return llm
+
+
+def create_llm(config: AgentConfig) -> ChatOllama:
+    """Create (or reuse) a ChatOllama instance with the given configuration."""
+    return _cached_llm(config.model, config.temperature, config.base_url, config.max_tokens)
 
 
 def format_messages(history: list[dict]) -> list:
@@ -1,9 +1,21 @@
 """Entry point for the ReAct Agent CLI."""
 import argparse
+import importlib
 import sys
+import threading
 
 from .config import AgentConfig, AVAILABLE_MODELS
-from .cli import run_cli
+
+
+def _prewarm_imports():
+    """Import the CLI (and with it LangChain/LangGraph) on a background thread.
+
+    The later import in main() then blocks only on whatever is left, instead
+    of paying the whole cost after argument parsing.
+    """
+    threading.Thread(
+        target=importlib.import_module, args=(f"{__package__}.cli",), daemon=True
+    ).start()
 
 
 def main():
@@ -11,6 +23,8 @@ def main():
         prog="react-agent",
         description="Baseline ReAct Agent - LangChain + Ollama",
     )
+    if "--list-models" not in sys.argv[1:]:
+        _prewarm_imports()
     
     parser.add_argument("-m", "--model", default="qwen3:4b", help="Ollama model (default: qwen3:4b)")
     parser.add_argument("--list-models", action="store_true", help="List models and exit")
@@ -18,6 +32,9 @@ def main():
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose mode")
     parser.add_argument("--temperature", type=float, default=0.7, help="Temperature (default: 0.7)")
     parser.add_argument("-c", "--command", help="Run single command and exit")
+    parser.add_argument("--server", action="store_true", help="Serve JSON-line tasks on stdin/stdout")
+    parser.add_argument("--batch", metavar="TASKS", help="Run tasks from a JSON-lines file and exit")
+    parser.add_argument("--out", metavar="RESULTS", help="JSON-lines results file for --batch (default: stdout)")
     
     args = parser.parse_args()
     
@@ -27,6 +44,8 @@ def main():
             print(f"  • {m}")
         return 0
     
+    from .cli import run_cli, run_server, run_batch
+    
     config = AgentConfig(
         model=args.model,
         temperature=args.temperature,
@@ -34,8 +53,19 @@ def main():
         verbose=args.verbose,
     )
     
+    if args.server:
+        config.streaming = False
+        run_server(config)
+        return 0
+    
+    if args.batch:
+        config.streaming = False
+        run_batch(args.batch, args.out, config)
+        return 0
+    
     if args.command:
         from .agent import ReactAgent
+        config.one_shot = True
         agent = ReactAgent(config)
         print(agent.run(args.command))
         return 0
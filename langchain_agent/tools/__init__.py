@@ -1,13 +1,29 @@
-"""Tool registry for ReAct Agent - exports LangChain tool instances."""
-from .file_tools import FILE_TOOLS
-from .shell_tools import SHELL_TOOLS
-from .web_tools import WEB_TOOLS
-from .code_tools import CODE_TOOLS
-from .utility_tools import UTILITY_TOOLS
-from .crawl_tools import CRAWL_TOOLS
+"""Tool registry for ReAct Agent - exports LangChain tool instances.
 
-# All tools as a flat list for LangChain agent
-ALL_TOOLS = FILE_TOOLS + SHELL_TOOLS + WEB_TOOLS + CODE_TOOLS + UTILITY_TOOLS + CRAWL_TOOLS
+Tool groups are imported on first attribute access (PEP 562), so importing
+this package is cheap and heavy tool modules load only when requested.
+"""
+import importlib
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .file_tools import FILE_TOOLS
+    from .shell_tools import SHELL_TOOLS
+    from .web_tools import WEB_TOOLS
+    from .code_tools import CODE_TOOLS
+    from .utility_tools import UTILITY_TOOLS
+    from .crawl_tools import CRAWL_TOOLS
+
+# Tool group name -> submodule that defines it
+_GROUPS = {
+    "FILE_TOOLS": ".file_tools",
+    "SHELL_TOOLS": ".shell_tools",
+    "WEB_TOOLS": ".web_tools",
+    "CODE_TOOLS": ".code_tools",
+    "UTILITY_TOOLS": ".utility_tools",
+    "CRAWL_TOOLS": ".crawl_tools",
+}
 
 __all__ = [
     "ALL_TOOLS",
@@ -18,3 +34,21 @@ __all__ = [
     "UTILITY_TOOLS",
     "CRAWL_TOOLS",
 ]
+
+
+def __getattr__(name: str):
+    if name in _GROUPS:
+        value = getattr(importlib.import_module(_GROUPS[name], __name__), name)
+    elif name == "ALL_TOOLS":
+        # All tools as a flat list for LangChain agent
+        module = sys.modules[__name__]
+        value = [t for group in _GROUPS for t in getattr(module, group)]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,8 +2,304 @@
 import os
 import re
 import ast
+import mmap
+import shutil
+import itertools
+import textwrap
+import threading
+import multiprocessing
+import subprocess
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from langchain_core.tools import tool
 
+from .file_tools import IGNORE_DIRS
+from .scanning import MMAP_THRESHOLD, compile_scan, scan_batch, scan_file
+
+
+# Extensions searched by find_definition, and by grep_code per file_pattern
+DEFINITION_EXTS = frozenset({'.py', '.js', '.ts', '.jsx', '.tsx'})
+GREP_EXTS = {
+    "*.py": frozenset({'.py'}),
+    "*.js": frozenset({'.js', '.jsx'}),
+    "*.ts": frozenset({'.ts', '.tsx'}),
+    "*": frozenset({'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', '.rs', '.c', '.cpp', '.h'}),
+}
+
+
+# Node types whose children can be statements (and so can hold imports)
+_BLOCK_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+# Parsed trees of recently analysed files, keyed by (path, mtime_ns, size)
+_AST_CACHE_SIZE = 32
+_AST_CACHE: OrderedDict = OrderedDict()
+_AST_CACHE_LOCK = threading.Lock()
+
+
+def _cached_parse(path: str, source, st: os.stat_result) -> ast.AST:
+    """Parse ``source`` (read from ``path``), reusing the tree while the file is unchanged.
+
+    ``st`` is the file's stat taken before ``source`` was read, so a file
+    modified mid-read is reparsed next time. ``source`` may be a string or
+    any bytes-like buffer, including an mmap. Syntax errors are raised as
+    from ``ast.parse`` and never cached. Callers must not modify the tree.
+    """
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _AST_CACHE_LOCK:
+        tree = _AST_CACHE.get(key)
+        if tree is not None:
+            _AST_CACHE.move_to_end(key)
+            return tree
+    
+    tree = ast.parse(source, filename=path)
+    with _AST_CACHE_LOCK:
+        _AST_CACHE[key] = tree
+        while len(_AST_CACHE) > _AST_CACHE_SIZE:
+            _AST_CACHE.popitem(last=False)
+    return tree
+
+
+def _parse_file(path: str):
+    """Parse a Python file, returning ``(tree, line_count)``.
+
+    Files of MMAP_THRESHOLD bytes or more are parsed and counted straight
+    from a memory map instead of being read into memory first.
+    """
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if st.st_size < MMAP_THRESHOLD:
+            source = f.read()
+            return _cached_parse(path, source, st), source.count(b'\n') + 1
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lines = sum(mm[i:i + MMAP_THRESHOLD].count(b'\n') for i in range(0, len(mm), MMAP_THRESHOLD))
+            return _cached_parse(path, mm, st), lines + 1
+
+
+def _line_starts(content: str, *linenos: int) -> list:
+    """Return the offsets in ``content`` where each 1-based line number starts.
+
+    Lines are counted on ``\\n`` as the parser does; a line past the end maps
+    to ``len(content)``. Scans forward once without splitting into lines.
+    """
+    starts = {}
+    offset, current = 0, 1
+    for lineno in sorted(set(linenos)):
+        while current < lineno:
+            newline = content.find('\n', offset)
+            if newline == -1:
+                offset = len(content)
+                break
+            offset = newline + 1
+            current += 1
+        starts[lineno] = offset
+    return [starts[lineno] for lineno in linenos]
+
+
+def _is_standalone_definition(new_content: str, indent: str, name: str) -> bool:
+    """Whether ``new_content`` is a valid definition of ``name`` indented by ``indent``.
+
+    Splicing such a definition over another one at the same indentation keeps
+    an already-valid file valid, so the whole file needn't be reparsed.
+    """
+    first = next((line for line in new_content.splitlines() if line.strip()), None)
+    if first is None or first[:len(first) - len(first.lstrip())] != indent:
+        return False
+    
+    # Every line must share the definition's indentation as its margin
+    dedented = textwrap.dedent(new_content)
+    if not dedented.lstrip("\n").startswith(first.lstrip()):
+        return False
+    
+    try:
+        body = ast.parse(dedented).body
+    except SyntaxError:
+        return False
+    return (bool(body) and isinstance(body[0], (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            and body[0].name == name)
+
+
+# ripgrep is used for multi-file scans when installed
+RG_PATH = shutil.which("rg")
+# Hidden directories are already skipped by rg
+_RG_EXCLUDE_GLOBS = tuple(f"!{d}" for d in sorted(IGNORE_DIRS) if not d.startswith('.'))
+
+FIND_LIMIT = 20
+GREP_LIMIT = 30
+
+
+def _ripgrep(pattern: str, directory: str, exts, limit: int, ignore_case: bool = False):
+    """Search files under ``directory`` ending in one of ``exts`` with ripgrep.
+
+    Returns up to ``limit`` ``(path, line_number, line)`` tuples, killing rg
+    once the limit is reached, or None when rg is not installed or fails
+    (e.g. on regex syntax it does not support), in which case callers fall
+    back to scanning in Python.
+    """
+    if RG_PATH is None:
+        return None
+    
+    # Hidden dirs are skipped by rg itself; --no-ignore matches the Python
+    # scan, which does not read .gitignore
+    cmd = [RG_PATH, "--line-number", "--no-heading", "--with-filename", "--null",
+           "--color", "never", "--no-ignore", "--no-messages", "--max-count", str(limit)]
+    if ignore_case:
+        cmd.append("--ignore-case")
+    for ext in sorted(exts):
+        cmd += ["--glob", f"*{ext}"]
+    for glob in _RG_EXCLUDE_GLOBS:
+        cmd += ["--glob", glob]
+    cmd += ["--regexp", pattern, "--", directory]
+    
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, errors='replace')
+    except OSError:
+        return None
+    
+    timer = threading.Timer(60, proc.kill)
+    timer.start()
+    matches = []
+    try:
+        for line in proc.stdout:
+            filepath, _, rest = line.partition("\0")
+            lineno, _, text = rest.partition(":")
+            if lineno.isdigit():
+                matches.append((filepath, int(lineno), text.strip()))
+                if len(matches) >= limit:
+                    proc.kill()
+                    return matches
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        proc.wait()
+    
+    # 0 = matches, 1 = no matches, 2 = error (possibly alongside matches);
+    # anything else means rg was killed by the timeout
+    if proc.returncode not in (0, 1, 2) or (proc.returncode == 2 and not matches):
+        return None
+    return matches
+
+
+# Regex syntax that can match a newline or anchor to the ends of the string
+# (conservatively: whitespace/negated classes, escapes, DOTALL, \A, \Z)
+_NEWLINE_CAPABLE = re.compile(r'\\[sWDnxuUN0-9AZtrvf]|\[\^|\(\?[a-zA-Z]*s')
+
+
+# Trees with at least this many candidate files are scanned in worker
+# processes when ripgrep isn't available. A serial scan takes about 0.1 ms
+# per 12 KB source file and a running pool adds about a tenth to that, so
+# two or more workers win from a few dozen files; starting the pool takes
+# about 0.2 s, the time of a 2000-file serial scan, so the first pool is
+# only started for a tree that big
+PARALLEL_MIN_FILES = 50
+PARALLEL_START_FILES = 2000
+SCAN_BATCH = 32
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared scan worker pool, creating it on first use.
+
+    Workers are started by a fork server (or spawned) rather than forked
+    from this process, which has other threads running.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _POOL = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                        mp_context=multiprocessing.get_context(method))
+        return _POOL
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken worker pool so the next parallel scan starts a fresh one."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_source_files(directory: str, exts):
+    """Yield files under ``directory`` ending in ``exts``, skipping hidden and vendored directories.
+
+    ``exts`` is a frozenset of extensions (matched by lookup), or a tuple of
+    arbitrary suffixes such as ``.test.js``.
+    """
+    by_extension = isinstance(exts, frozenset)
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in IGNORE_DIRS]
+        
+        for file in files:
+            if (os.path.splitext(file)[1] in exts) if by_extension else file.endswith(exts):
+                yield os.path.join(root, file)
+
+
+def _scan_files(directory: str, exts, pattern: str, flags: int = 0,
+                anchored: bool = False, buffer_pattern=None):
+    """Yield ``(path, line_number, line)`` for lines matching ``pattern``.
+
+    ``anchored`` matches at the start of the line instead of searching it;
+    ``buffer_pattern`` enables whole-file scans (see compile_scan). Small trees are
+    scanned in this process; once PARALLEL_MIN_FILES files turn up (or
+    PARALLEL_START_FILES, while no pool is running), batches are handed to
+    a process pool and results come back in walk order. Lazy, so callers
+    can stop early and the remaining batches are cancelled.
+    """
+    files = _iter_source_files(directory, exts)
+    min_files = PARALLEL_MIN_FILES if _POOL is not None else PARALLEL_START_FILES
+    head = list(itertools.islice(files, min_files))
+    
+    if len(head) < min_files or (os.cpu_count() or 1) < 2:
+        matchers = compile_scan(pattern, flags, anchored, buffer_pattern)
+        for filepath in itertools.chain(head, files):
+            for i, line in scan_file(filepath, *matchers):
+                yield filepath, i, line
+        return
+    
+    pool = _get_pool()
+    remaining = itertools.chain(head, files)
+    batches = iter(lambda: list(itertools.islice(remaining, SCAN_BATCH)), [])
+    args = (pattern, flags, anchored, buffer_pattern)
+    
+    # Batches not yet yielded, in order, each with its future; a batch is
+    # queued before it is submitted so a failed submit leaves it to rescan
+    pending = deque()
+    
+    def submit(batch):
+        entry = [batch, None]
+        pending.append(entry)
+        entry[1] = pool.submit(scan_batch, batch, *args)
+    
+    try:
+        # Keep a bounded window of batches in flight, consumed in order
+        for batch in itertools.islice(batches, 2 * (os.cpu_count() or 1)):
+            submit(batch)
+        while pending:
+            results = pending[0][1].result()
+            batch = next(batches, None)
+            if batch is not None:
+                submit(batch)
+            pending.popleft()
+            yield from results
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); scan what is left in this process
+        _discard_pool(pool)
+        unscanned = [batch for batch, _ in pending]
+        pending.clear()
+        matchers = compile_scan(pattern, flags, anchored, buffer_pattern)
+        for filepath in itertools.chain(itertools.chain.from_iterable(unscanned), remaining):
+            for i, line in scan_file(filepath, *matchers):
+                yield filepath, i, line
+    finally:
+        for _, future in pending:
+            if future is not None:
+                future.cancel()
+
 
 @tool
 def analyze_code(path: str) -> str:
@@ -14,26 +310,36 @@ def analyze_code(path: str) -> str:
     """
     try:
         path = os.path.expanduser(path)
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
         try:
-            tree = ast.parse(content)
+            tree, lines = _parse_file(path)
         except SyntaxError as e:
             return f"Syntax error in file: {e}"
         
         analysis = [f"Code Analysis: {path}\n"]
         
-        # Imports
+        # Single pass over statements (expressions never hold imports):
+        # imports at any depth, classes and functions at module level.
         imports = []
-        for node in ast.walk(tree):
+        classes = []
+        functions = []
+        stack = [(node, True) for node in reversed(tree.body)]
+        while stack:
+            node, top_level = stack.pop()
             if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
+                imports.extend(alias.name for alias in node.names)
+                continue
+            if isinstance(node, ast.ImportFrom):
                 module = node.module or ''
-                for alias in node.names:
-                    imports.append(f"{module}.{alias.name}")
+                imports.extend(f"{module}.{alias.name}" for alias in node.names)
+                continue
+            if top_level and isinstance(node, ast.ClassDef):
+                methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
+                classes.append((node.name, methods, node.lineno))
+            elif top_level and isinstance(node, ast.FunctionDef):
+                args = [arg.arg for arg in node.args.args]
+                functions.append((node.name, args, node.lineno))
+            children = [c for c in ast.iter_child_nodes(node) if isinstance(c, _BLOCK_NODES)]
+            stack.extend((child, False) for child in reversed(children))
         
         if imports:
             analysis.append("**Imports:**")
@@ -43,13 +349,6 @@ def analyze_code(path: str) -> str:
                 analysis.append(f"  ... and {len(imports) - 20} more")
             analysis.append("")
         
-        # Classes
-        classes = []
-        for node in ast.iter_child_nodes(tree):
-            if isinstance(node, ast.ClassDef):
-                methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                classes.append((node.name, methods, node.lineno))
-        
         if classes:
             analysis.append("**Classes:**")
             for name, methods, line in classes:
@@ -60,13 +359,6 @@ def analyze_code(path: str) -> str:
                     analysis.append(f"      ... and {len(methods) - 5} more methods")
             analysis.append("")
         
-        # Functions
-        functions = []
-        for node in ast.iter_child_nodes(tree):
-            if isinstance(node, ast.FunctionDef):
-                args = [arg.arg for arg in node.args.args]
-                functions.append((node.name, args, node.lineno))
-        
         if functions:
             analysis.append("**Functions:**")
             for name, args, line in functions:
@@ -74,7 +366,6 @@ def analyze_code(path: str) -> str:
                 analysis.append(f"  - {name}({args_str}) - line {line}")
             analysis.append("")
         
-        lines = content.count('\n') + 1
         analysis.append(f"**Stats:** {lines} lines, {len(classes)} classes, {len(functions)} functions")
         
         return "\n".join(analysis)
@@ -95,38 +386,27 @@ def find_definition(symbol: str, directory: str = ".") -> str:
     """
     try:
         directory = os.path.expanduser(directory)
-        results = []
+        exts = DEFINITION_EXTS
         
-        patterns = [
-            rf'^(?:def|class)\s+{re.escape(symbol)}\s*[\(:]',
-            rf'^{re.escape(symbol)}\s*=',
-            rf'^\s+{re.escape(symbol)}\s*=',
-        ]
+        # def/class at column 0, or an assignment at any indentation
+        name = re.escape(symbol)
+        definition = rf'(?:def|class)\s+{name}\s*[\(:]|\s*{name}\s*='
         
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', '.venv']]
-            
-            for file in files:
-                if file.endswith(('.py', '.js', '.ts', '.jsx', '.tsx')):
-                    filepath = os.path.join(root, file)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            for i, line in enumerate(f, 1):
-                                for pattern in patterns:
-                                    if re.match(pattern, line):
-                                        results.append(f"{filepath}:{i}: {line.strip()}")
-                                        break
-                    except:
-                        continue
+        # One match past the limit is enough to know the listing is truncated
+        results = _ripgrep(f"^(?:{definition})", directory, exts, FIND_LIMIT + 1)
+        if results is None:
+            matches = _scan_files(directory, exts, definition, anchored=True,
+                                  buffer_pattern=f"^(?:{definition})")
+            results = list(itertools.islice(matches, FIND_LIMIT + 1))
         
         if not results:
             return f"No definition found for '{symbol}' in {directory}"
         
         output = [f"Definitions of '{symbol}':\n"]
-        for result in results[:20]:
-            output.append(f"  {result}")
-        if len(results) > 20:
-            output.append(f"\n  ... and {len(results) - 20} more")
+        for filepath, lineno, line in results[:FIND_LIMIT]:
+            output.append(f"  {filepath}:{lineno}: {line}")
+        if len(results) > FIND_LIMIT:
+            output.append(f"\n  ... and more (showing first {FIND_LIMIT})")
         
         return "\n".join(output)
         
@@ -145,42 +425,34 @@ def grep_code(pattern: str, directory: str = ".", file_pattern: str = "*.py") ->
     """
     try:
         directory = os.path.expanduser(directory)
-        results = []
-        regex = re.compile(pattern, re.IGNORECASE)
+        # Compile up front so bad patterns are reported before any search
+        re.compile(pattern, re.IGNORECASE)
         
-        extensions = {
-            "*.py": [".py"],
-            "*.js": [".js", ".jsx"],
-            "*.ts": [".ts", ".tsx"],
-            "*": [".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go", ".rs", ".c", ".cpp", ".h"],
-        }
+        exts = GREP_EXTS.get(file_pattern)
+        if exts is None:
+            suffix = file_pattern.replace("*", "")
+            # A plain ".ext" can use the extension lookup; longer suffixes can't
+            exts = frozenset({suffix}) if suffix.startswith('.') and suffix.count('.') == 1 else (suffix,)
         
-        exts = extensions.get(file_pattern, [file_pattern.replace("*", "")])
-        
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', '.venv']]
-            
-            for file in files:
-                if any(file.endswith(ext) for ext in exts):
-                    filepath = os.path.join(root, file)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            for i, line in enumerate(f, 1):
-                                if regex.search(line):
-                                    results.append((filepath, i, line.strip()))
-                    except:
-                        continue
+        # One match past the limit is enough to know the listing is truncated
+        results = _ripgrep(pattern, directory, exts, GREP_LIMIT + 1, ignore_case=True)
+        if results is None:
+            # Patterns that could consume a newline match differently over
+            # a whole file, so those are scanned line by line
+            buffer_pattern = None if _NEWLINE_CAPABLE.search(pattern) else pattern
+            matches = _scan_files(directory, exts, pattern, re.IGNORECASE, buffer_pattern=buffer_pattern)
+            results = list(itertools.islice(matches, GREP_LIMIT + 1))
         
         if not results:
             return f"No matches found for '{pattern}' in {directory}"
         
-        output = [f"Found {len(results)} matches for '{pattern}':\n"]
-        for filepath, lineno, line in results[:30]:
+        if len(results) > GREP_LIMIT:
+            output = [f"Found {GREP_LIMIT}+ matches for '{pattern}' (truncated):\n"]
+        else:
+            output = [f"Found {len(results)} matches for '{pattern}':\n"]
+        for filepath, lineno, line in results[:GREP_LIMIT]:
             output.append(f"  {filepath}:{lineno}: {line[:80]}{'...' if len(line) > 80 else ''}")
         
-        if len(results) > 30:
-            output.append(f"\n  ... and {len(results) - 30} more matches")
-        
         return "\n".join(output)
         
     except re.error as e:
@@ -200,10 +472,11 @@ def read_definition(path: str, name: str) -> str:
     try:
         path = os.path.expanduser(path)
         with open(path, 'r', encoding='utf-8') as f:
+            st = os.fstat(f.fileno())
             content = f.read()
             
         try:
-            tree = ast.parse(content)
+            tree = _cached_parse(path, content, st)
         except SyntaxError as e:
             return f"Syntax error in file: {e}"
             
@@ -217,12 +490,8 @@ def read_definition(path: str, name: str) -> str:
         if not target:
             return f"Error: Definition '{name}' not found in {path}"
             
-        lines = content.splitlines()
-        # ast.get_source_segment is available in Python 3.8+
-        start = target.lineno - 1
-        end = target.end_lineno
-        
-        definition_code = "\n".join(lines[start:end])
+        start, end = _line_starts(content, target.lineno, target.end_lineno + 1)
+        definition_code = content[start:end].removesuffix("\n")
         return f"Definition of '{name}' in '{path}':\n```python\n{definition_code}\n```"
         
     except FileNotFoundError:
@@ -243,10 +512,11 @@ def replace_definition(path: str, name: str, new_content: str) -> str:
     try:
         path = os.path.expanduser(path)
         with open(path, 'r', encoding='utf-8') as f:
+            st = os.fstat(f.fileno())
             content = f.read()
             
         try:
-            tree = ast.parse(content)
+            tree = _cached_parse(path, content, st)
         except SyntaxError as e:
             return f"Syntax error in file: {e}"
             
@@ -260,12 +530,11 @@ def replace_definition(path: str, name: str, new_content: str) -> str:
         if not target:
             return f"Error: Definition '{name}' not found in {path}"
             
-        lines = content.splitlines()
-        start = target.lineno - 1
-        end = target.end_lineno
+        start, end = _line_starts(content, target.lineno, target.end_lineno + 1)
+        first_line = content[start:end].partition("\n")[0]
         
         # Keep indentation of the original definition if new_content isn't indented
-        original_indent = len(lines[start]) - len(lines[start].lstrip())
+        original_indent = len(first_line) - len(first_line.lstrip())
         new_lines = new_content.splitlines()
         if new_lines and (len(new_lines[0]) - len(new_lines[0].lstrip()) == 0) and original_indent > 0:
              # Add indentation to new content
@@ -273,15 +542,19 @@ def replace_definition(path: str, name: str, new_content: str) -> str:
              new_lines = [indent_str + line if line.strip() else line for line in new_lines]
              new_content = "\n".join(new_lines)
 
-        # Reconstruct file content
-        new_file_lines = lines[:start] + new_content.splitlines() + lines[end:]
-        new_file_content = "\n".join(new_file_lines)
+        # Splice the new definition between the untouched surrounding text
+        if content[start:end].endswith("\n") and not new_content.endswith("\n"):
+            new_content += "\n"
+        new_file_content = content[:start] + new_content + content[end:]
         
-        # Verify syntax of new content
-        try:
-            ast.parse(new_file_content)
-        except SyntaxError as e:
-           return f"Error: New content would cause syntax error: {e}"
+        # Verify syntax: checking the new definition alone is enough when it
+        # lines up with the one it replaces, otherwise reparse the whole file
+        indent = first_line[:original_indent]
+        if not _is_standalone_definition(new_content, indent, name):
+            try:
+                ast.parse(new_file_content)
+            except SyntaxError as e:
+                return f"Error: New content would cause syntax error: {e}"
            
         with open(path, 'w', encoding='utf-8') as f:
             f.write(new_file_content)
@@ -1,20 +1,96 @@
 """Web scraping tools using Crawl4AI - powerful async web scraping."""
 import asyncio
+import atexit
+import threading
 from langchain_core.tools import tool
 
 
-def _run_async(coro):
-    """Helper to run async code in sync context."""
+# All crawls run on one background event loop so the browser outlives each call
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_LOCK = threading.Lock()
+
+# One browser shared by all crawl tools, started on _LOOP
+_CRAWLER = None
+_CRAWLER_LOCK = asyncio.Lock()
+
+# Longest a tool waits for its crawl, in seconds. crawl4ai gives up on a
+# page load after 60 s itself, so this only cuts off crawls that hang
+_CRAWL_TIMEOUT = 90
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start the background event loop thread on first use."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="crawl-loop", daemon=True).start()
+            _LOOP = loop
+    return _LOOP
+
+
+async def _get_crawler():
+    """Return a started AsyncWebCrawler, launching the browser only once."""
+    global _CRAWLER
+    async with _CRAWLER_LOCK:
+        if _CRAWLER is None:
+            from crawl4ai import AsyncWebCrawler
+            
+            crawler = AsyncWebCrawler()
+            await crawler.start()
+            _CRAWLER = crawler
+    return _CRAWLER
+
+
+async def _close_crawler():
+    """Close the shared crawler, if one was started."""
+    global _CRAWLER
+    if _CRAWLER is not None:
+        crawler, _CRAWLER = _CRAWLER, None
+        await crawler.close()
+
+
+@atexit.register
+def _shutdown_loop():
+    global _LOOP
+    with _LOOP_LOCK:
+        loop, _LOOP = _LOOP, None
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_crawler(), loop).result(timeout=10)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def _reset_crawler(loop: asyncio.AbstractEventLoop) -> None:
+    """Close the shared crawler so the next crawl launches a fresh browser."""
+    try:
+        asyncio.run_coroutine_threadsafe(_close_crawler(), loop).result(timeout=10)
+    except Exception:
+        pass
+
+
+def _run_async(coro, extra_seconds: float = 0):
+    """Helper to run async code in sync context.
+
+    Raises TimeoutError, after cancelling ``coro``, if it runs for more than
+    _CRAWL_TIMEOUT seconds plus ``extra_seconds``.
+    """
+    timeout = _CRAWL_TIMEOUT + extra_seconds
+    loop = _get_loop()
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Create a new loop in a thread
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                return pool.submit(asyncio.run, coro).result()
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"timed out after {timeout:g}s") from None
+    except Exception:
+        # Page failures come back as result.success; an exception means the
+        # browser itself is in trouble, so start a fresh one next time
+        _reset_crawler(loop)
+        raise
 
 
 @tool
@@ -25,18 +101,56 @@ def crawl_webpage(url: str) -> str:
         url: The URL to crawl and extract content from
     """
     async def _crawl():
-        from crawl4ai import AsyncWebCrawler
+        crawler = await _get_crawler()
+        result = await crawler.arun(url=url)
         
-        async with AsyncWebCrawler() as crawler:
-            result = await crawler.arun(url=url)
-            
-            if not result.success:
-                return f"Failed to crawl {url}: {result.error_message}"
-            
-            # Get markdown content (cleaner than raw HTML)
-            content = result.markdown[:8000] if result.markdown else "No content extracted"
-            
-            return f"**Crawled: {url}**\n\nTitle: {result.title or 'N/A'}\n\n{content}"
+        if not result.success:
+            return f"Failed to crawl {url}: {result.error_message}"
+        
+        # Get markdown content (cleaner than raw HTML)
+        content = result.markdown[:8000] if result.markdown else "No content extracted"
+        
+        return f"**Crawled: {url}**\n\nTitle: {result.title or 'N/A'}\n\n{content}"
+    
+    try:
+        return _run_async(_crawl())
+    except Exception as e:
+        return f"Crawl error: {e}"
+
+
+@tool
+def crawl_bulk(urls: list[str]) -> str:
+    """Crawl several webpages at once and extract markdown content from each.
+    
+    Args:
+        urls: The URLs to crawl (up to 10)
+    """
+    urls = urls[:10]
+    
+    async def _crawl():
+        crawler = await _get_crawler()
+        results = await asyncio.gather(
+            *(crawler.arun(url=u) for u in urls),
+            return_exceptions=True,
+        )
+        if any(isinstance(result, Exception) for result in results):
+            # As in _run_async: the browser is in trouble, replace it
+            await _close_crawler()
+        
+        output = [f"**Crawled {len(urls)} pages**\n"]
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                output.append(f"### {url}\nCrawl error: {result}\n")
+            elif not result.success:
+                output.append(f"### {url}\nFailed to crawl: {result.error_message}\n")
+            else:
+                content = result.markdown[:2000] if result.markdown else "No content extracted"
+                output.append(f"### {url}\nTitle: {result.title or 'N/A'}\n\n{content}\n")
+        
+        return "\n".join(output)
+    
+    if not urls:
+        return "Error: No URLs given"
     
     try:
         return _run_async(_crawl())
@@ -53,25 +167,25 @@ def crawl_with_js(url: str, wait_seconds: int = 2) -> str:
         wait_seconds: Seconds to wait for JS to render (default: 2)
     """
     async def _crawl():
-        from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+        from crawl4ai import CrawlerRunConfig
         
         config = CrawlerRunConfig(
             wait_until="networkidle",
             delay_before_return_html=wait_seconds,
         )
         
-        async with AsyncWebCrawler() as crawler:
-            result = await crawler.arun(url=url, config=config)
-            
-            if not result.success:
-                return f"Failed to crawl {url}: {result.error_message}"
-            
-            content = result.markdown[:8000] if result.markdown else "No content extracted"
-            
-            return f"**Crawled (JS): {url}**\n\nTitle: {result.title or 'N/A'}\n\n{content}"
+        crawler = await _get_crawler()
+        result = await crawler.arun(url=url, config=config)
+        
+        if not result.success:
+            return f"Failed to crawl {url}: {result.error_message}"
+        
+        content = result.markdown[:8000] if result.markdown else "No content extracted"
+        
+        return f"**Crawled (JS): {url}**\n\nTitle: {result.title or 'N/A'}\n\n{content}"
     
     try:
-        return _run_async(_crawl())
+        return _run_async(_crawl(), extra_seconds=wait_seconds)
     except Exception as e:
         return f"Crawl error: {e}"
 
@@ -84,35 +198,33 @@ def extract_links(url: str) -> str:
         url: The URL to extract links from
     """
     async def _crawl():
-        from crawl4ai import AsyncWebCrawler
+        crawler = await _get_crawler()
+        result = await crawler.arun(url=url)
         
-        async with AsyncWebCrawler() as crawler:
-            result = await crawler.arun(url=url)
-            
-            if not result.success:
-                return f"Failed to crawl {url}"
-            
-            links = result.links or {}
-            internal = links.get('internal', [])[:20]
-            external = links.get('external', [])[:20]
-            
-            output = [f"**Links from {url}**\n"]
-            
-            if internal:
-                output.append("**Internal Links:**")
-                for link in internal:
-                    href = link.get('href', 'N/A')
-                    text = link.get('text', '')[:50]
-                    output.append(f"  - {text or 'No text'}: {href}")
-            
-            if external:
-                output.append("\n**External Links:**")
-                for link in external:
-                    href = link.get('href', 'N/A')
-                    text = link.get('text', '')[:50]
-                    output.append(f"  - {text or 'No text'}: {href}")
-            
-            return "\n".join(output)
+        if not result.success:
+            return f"Failed to crawl {url}"
+        
+        links = result.links or {}
+        internal = links.get('internal', [])[:20]
+        external = links.get('external', [])[:20]
+        
+        output = [f"**Links from {url}**\n"]
+        
+        if internal:
+            output.append("**Internal Links:**")
+            for link in internal:
+                href = link.get('href', 'N/A')
+                text = link.get('text', '')[:50]
+                output.append(f"  - {text or 'No text'}: {href}")
+        
+        if external:
+            output.append("\n**External Links:**")
+            for link in external:
+                href = link.get('href', 'N/A')
+                text = link.get('text', '')[:50]
+                output.append(f"  - {text or 'No text'}: {href}")
+        
+        return "\n".join(output)
     
     try:
         return _run_async(_crawl())
@@ -128,26 +240,24 @@ def extract_images(url: str) -> str:
         url: The URL to extract images from
     """
     async def _crawl():
-        from crawl4ai import AsyncWebCrawler
+        crawler = await _get_crawler()
+        result = await crawler.arun(url=url)
         
-        async with AsyncWebCrawler() as crawler:
-            result = await crawler.arun(url=url)
-            
-            if not result.success:
-                return f"Failed to crawl {url}"
-            
-            images = result.media.get('images', [])[:15] if result.media else []
-            
-            if not images:
-                return f"No images found on {url}"
-            
-            output = [f"**Images from {url}** ({len(images)} found)\n"]
-            for i, img in enumerate(images, 1):
-                src = img.get('src', 'N/A')
-                alt = img.get('alt', 'No alt text')[:60]
-                output.append(f"{i}. {alt}\n   {src}")
-            
-            return "\n".join(output)
+        if not result.success:
+            return f"Failed to crawl {url}"
+        
+        images = result.media.get('images', [])[:15] if result.media else []
+        
+        if not images:
+            return f"No images found on {url}"
+        
+        output = [f"**Images from {url}** ({len(images)} found)\n"]
+        for i, img in enumerate(images, 1):
+            src = img.get('src', 'N/A')
+            alt = img.get('alt', 'No alt text')[:60]
+            output.append(f"{i}. {alt}\n   {src}")
+        
+        return "\n".join(output)
     
     try:
         return _run_async(_crawl())
@@ -163,7 +273,7 @@ def screenshot_webpage(url: str) -> str:
         url: The URL to screenshot
     """
     async def _crawl():
-        from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+        from crawl4ai import CrawlerRunConfig
         import base64
         import os
         
@@ -172,21 +282,21 @@ def screenshot_webpage(url: str) -> str:
             wait_until="networkidle",
         )
         
-        async with AsyncWebCrawler() as crawler:
-            result = await crawler.arun(url=url, config=config)
-            
-            if not result.success:
-                return f"Failed to screenshot {url}"
-            
-            if result.screenshot:
-                # Save screenshot
-                filename = f"/tmp/screenshot_{url.replace('/', '_').replace(':', '')[:50]}.png"
-                img_data = base64.b64decode(result.screenshot)
-                with open(filename, 'wb') as f:
-                    f.write(img_data)
-                return f"Screenshot saved to: {filename}\nTitle: {result.title}"
-            
-            return "No screenshot captured"
+        crawler = await _get_crawler()
+        result = await crawler.arun(url=url, config=config)
+        
+        if not result.success:
+            return f"Failed to screenshot {url}"
+        
+        if result.screenshot:
+            # Save screenshot
+            filename = f"/tmp/screenshot_{url.replace('/', '_').replace(':', '')[:50]}.png"
+            img_data = base64.b64decode(result.screenshot)
+            with open(filename, 'wb') as f:
+                f.write(img_data)
+            return f"Screenshot saved to: {filename}\nTitle: {result.title}"
+        
+        return "No screenshot captured"
     
     try:
         return _run_async(_crawl())
@@ -197,6 +307,7 @@ def screenshot_webpage(url: str) -> str:
 # Export all crawl4ai tools
 CRAWL_TOOLS = [
     crawl_webpage,
+    crawl_bulk,
     crawl_with_js,
     extract_links,
     extract_images,
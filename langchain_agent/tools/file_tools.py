@@ -1,10 +1,154 @@
 """File operation tools using LangChain @tool decorator."""
 import os
-import glob
+import re
+import mmap
+import shutil
+import tempfile
+import contextlib
+from fnmatch import fnmatchcase
 from pathlib import Path
 from datetime import datetime
 from langchain_core.tools import tool
 
+from .scanning import MMAP_THRESHOLD
+
+
+# Directories that wildcard and ** components never descend into
+IGNORE_DIRS = frozenset({'node_modules', '__pycache__', 'venv', '.venv'})
+SEARCH_LIMIT = 50
+_GLOB_MAGIC = re.compile(r'[*?[]')
+
+
+def _read_text(path: str) -> str:
+    """Read a UTF-8 text file with universal newlines.
+
+    Files of MMAP_THRESHOLD bytes or more are decoded straight from a memory
+    map, skipping the buffered text layer's intermediate copies.
+    """
+    if os.path.getsize(path) < MMAP_THRESHOLD:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        content = str(mm, 'utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+@contextlib.contextmanager
+def _atomic_open(path: str, mode: str = 'w'):
+    """Open a temp file beside the file at ``path`` that replaces it on success.
+
+    Readers see either the old or the new file, never a partial write.
+    Symlinks are resolved first, so the file they point at is what changes,
+    and the original file's permissions, and owner and group where allowed,
+    are kept. A file with other hard links is overwritten in place from the
+    finished temp file instead, since renaming over it would split the
+    links. Text modes use UTF-8.
+    """
+    path = os.path.realpath(path)
+    st = os.stat(path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+        
+        if st.st_nlink > 1:
+            with open(tmp_path, 'rb') as src, open(path, 'r+b') as dst:
+                shutil.copyfileobj(src, dst)
+                dst.truncate()
+            os.unlink(tmp_path)
+            return
+        
+        os.chmod(tmp_path, st.st_mode & 0o7777)
+        if hasattr(os, 'chown'):
+            tmp_st = os.stat(tmp_path)
+            if (tmp_st.st_uid, tmp_st.st_gid) != (st.st_uid, st.st_gid):
+                with contextlib.suppress(PermissionError):
+                    os.chown(tmp_path, st.st_uid, st.st_gid)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _line_start(buf, line: int):
+    """Return the byte offset where 1-based ``line`` starts in ``buf``.
+
+    One past the last line is valid (the end of the file); anything further
+    returns None.
+    """
+    offset = 0
+    for i in range(line - 1):
+        newline = buf.find(b'\n', offset)
+        if newline == -1:
+            # Only the end of a final unterminated line is a valid position
+            return len(buf) if i == line - 2 and offset < len(buf) else None
+        offset = newline + 1
+    return offset
+
+
+def _count_lines(buf) -> int:
+    """Count lines in a bytes-like buffer the way readlines() splits them."""
+    newlines = sum(buf[i:i + MMAP_THRESHOLD].count(b'\n') for i in range(0, len(buf), MMAP_THRESHOLD))
+    return newlines + (1 if buf[-1:] not in (b'', b'\n') else 0)
+
+
+def _sorted_entries(dirpath: str) -> list:
+    """Return the entries of ``dirpath`` sorted by name, or [] if it can't be read."""
+    try:
+        with os.scandir(dirpath or '.') as it:
+            return sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+
+def _iter_glob(dirpath: str, parts: list):
+    """Yield paths under ``dirpath`` matching the glob components ``parts``.
+
+    Follows glob's recursive semantics (``**`` spans any number of
+    directories, wildcards skip hidden names) but walks with scandir and
+    never descends into hidden or IGNORE_DIRS directories via a wildcard.
+    """
+    part, rest = parts[0], parts[1:]
+    
+    if part == '**':
+        if rest:
+            yield from _iter_glob(dirpath, rest)
+        for entry in _sorted_entries(dirpath):
+            if entry.name.startswith('.') or entry.name in IGNORE_DIRS:
+                continue
+            path = os.path.join(dirpath, entry.name)
+            if not rest:
+                yield path
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_glob(path, parts)
+        return
+    
+    if not _GLOB_MAGIC.search(part):
+        path = os.path.join(dirpath, part)
+        if rest:
+            if os.path.isdir(path):
+                yield from _iter_glob(path, rest)
+        elif os.path.lexists(path):
+            yield path
+        return
+    
+    show_hidden = part.startswith('.')
+    for entry in _sorted_entries(dirpath):
+        name = entry.name
+        if name.startswith('.') and not show_hidden:
+            continue
+        if not fnmatchcase(name, part):
+            continue
+        path = os.path.join(dirpath, name)
+        if not rest:
+            yield path
+        elif name not in IGNORE_DIRS and entry.is_dir():
+            yield from _iter_glob(path, rest)
+
 
 @tool
 def read_file(path: str) -> str:
@@ -15,8 +159,7 @@ def read_file(path: str) -> str:
     """
     try:
         path = os.path.expanduser(path)
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = _read_text(path)
         return f"File contents of '{path}':\n```\n{content}\n```"
     except FileNotFoundError:
         return f"Error: File not found: {path}"
@@ -86,17 +229,39 @@ def search_files(pattern: str, directory: str = ".") -> str:
     try:
         directory = os.path.expanduser(directory)
         full_pattern = os.path.join(directory, pattern)
-        matches = glob.glob(full_pattern, recursive=True)
+        if os.altsep:
+            full_pattern = full_pattern.replace(os.altsep, os.sep)
+        
+        # Walk from the longest literal prefix of the pattern
+        parts = full_pattern.split(os.sep)
+        literal = 0
+        while literal < len(parts) and not _GLOB_MAGIC.search(parts[literal]):
+            literal += 1
+        
+        if literal == len(parts):
+            candidates = iter([full_pattern] if os.path.lexists(full_pattern) else [])
+        else:
+            root = os.sep.join(parts[:literal]) or (os.sep if literal else '')
+            candidates = _iter_glob(root, parts[literal:])
+        
+        # Stop walking once the listing would be truncated anyway
+        matches = []
+        for match in candidates:
+            matches.append(match)
+            if len(matches) > SEARCH_LIMIT:
+                break
         
         if not matches:
             return f"No files matching '{pattern}' found in '{directory}'"
         
-        results = [f"Found {len(matches)} file(s) matching '{pattern}':"]
-        for match in sorted(matches)[:50]:
+        truncated = len(matches) > SEARCH_LIMIT
+        count = f"{SEARCH_LIMIT}+" if truncated else len(matches)
+        results = [f"Found {count} file(s) matching '{pattern}':"]
+        for match in sorted(matches[:SEARCH_LIMIT]):
             results.append(f"  - {match}")
         
-        if len(matches) > 50:
-            results.append(f"  ... and {len(matches) - 50} more")
+        if truncated:
+            results.append("  ... and more")
         
         return "\n".join(results)
     except Exception as e:
@@ -158,15 +323,16 @@ def replace_in_file(path: str, old_text: str, new_text: str) -> str:
         with open(path, 'r', encoding='utf-8') as f:
             content = f.read()
             
-        if old_text not in content:
+        count = content.count(old_text)
+        if count == 0:
             return f"Error: Text not found in file: {old_text[:50]}..."
-            
-        new_content = content.replace(old_text, new_text)
         
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        # Nothing would change, so leave the file untouched
+        if old_text != new_text:
+            with _atomic_open(path) as f:
+                f.write(content.replace(old_text, new_text, count))
             
-        return f"Successfully replaced {content.count(old_text)} occurrence(s) in '{path}'"
+        return f"Successfully replaced {count} occurrence(s) in '{path}'"
     except FileNotFoundError:
         return f"Error: File not found: {path}"
     except Exception as e:
@@ -184,23 +350,32 @@ def insert_in_file(path: str, content: str, line: int = -1) -> str:
     """
     try:
         path = os.path.expanduser(path)
-        with open(path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
+        data = (content + "\n").encode('utf-8')
+        
         if line == -1:
-            lines.append(content + "\n")
-            inserted_at = "end"
-        else:
-            if line < 1 or line > len(lines) + 1:
-                return f"Error: Line {line} out of range (1-{len(lines)+1})"
-            lines.insert(line - 1, content + "\n")
-            inserted_at = f"line {line}"
-            
-        new_file_content = "".join(lines)
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(new_file_content)
+            # Appending leaves the existing content untouched ('r+b' so a
+            # missing file is still an error rather than created)
+            with open(path, 'r+b') as f:
+                f.seek(0, os.SEEK_END)
+                f.write(data)
+            return f"Successfully inserted content at end of '{path}'"
+        
+        # Find the insertion point in a memory map and copy the two halves
+        # around the new content without splitting the file into lines
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else contextlib.nullcontext(b'')
+            with mapped as buf:
+                offset = _line_start(buf, line) if line >= 1 else None
+                if offset is None:
+                    return f"Error: Line {line} out of range (1-{_count_lines(buf) + 1})"
+                
+                with memoryview(buf) as view, _atomic_open(path, 'wb') as out:
+                    out.write(view[:offset])
+                    out.write(data)
+                    out.write(view[offset:])
             
-        return f"Successfully inserted content at {inserted_at} of '{path}'"
+        return f"Successfully inserted content at line {line} of '{path}'"
     except FileNotFoundError:
         return f"Error: File not found: {path}"
     except Exception as e:
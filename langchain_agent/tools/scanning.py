@@ -0,0 +1,113 @@
+"""Per-file regex scanning for grep_code and find_definition.
+
+Kept apart from code_tools, and importing only the standard library, so
+the scan worker processes stay cheap to start: each one imports this
+module to unpickle scan_batch, and code_tools would pull in LangChain.
+"""
+import os
+import re
+import mmap
+
+
+# Files at least this large are read through a memory map
+MMAP_THRESHOLD = 1 << 20
+
+
+def scan_buffer(buf, regex, match):
+    """Yield ``(line_number, line)`` for matching lines of a whole-file buffer.
+
+    ``regex`` (compiled with re.MULTILINE, str or bytes to suit ``buf``) finds
+    candidate lines in one pass over the buffer; each candidate line is then
+    confirmed with ``match``, so results are the same as a line-by-line scan.
+    Line numbers are only counted up to each candidate.
+    """
+    newline = '\n' if isinstance(buf, str) else b'\n'
+    size = len(buf)
+    lineno = 1
+    counted = pos = 0
+    while pos < size:
+        found = regex.search(buf, pos)
+        if found is None:
+            return
+        start = buf.rfind(newline, 0, found.start()) + 1
+        if start >= size:
+            # An empty match after the final newline, where no line exists
+            return
+        end = buf.find(newline, found.start())
+        end = size if end == -1 else end + 1
+        
+        lineno += buf[counted:start].count(newline)
+        counted = start
+        line = buf[start:end]
+        if not isinstance(line, str):
+            line = line.decode('utf-8', errors='replace')
+        if match(line):
+            yield lineno, line.strip()
+        pos = end
+
+
+def compile_scan(pattern: str, flags: int, anchored: bool, buffer_pattern):
+    """Compile the ``(match, text_regex, bytes_regex)`` matchers used by scan_file.
+
+    ``buffer_pattern`` is a form of ``pattern`` for whole-file MULTILINE scans,
+    or None to scan line by line. The bytes form for memory-mapped files is
+    only built for ASCII patterns, since bytes patterns only fold ASCII case.
+    """
+    regex = re.compile(pattern, flags)
+    match = regex.match if anchored else regex.search
+    if buffer_pattern is None:
+        return match, None, None
+    
+    text_regex = re.compile(buffer_pattern, flags | re.MULTILINE)
+    bytes_regex = None
+    if buffer_pattern.isascii():
+        try:
+            bytes_regex = re.compile(buffer_pattern.encode(), flags | re.MULTILINE)
+        except re.error:
+            pass
+    return match, text_regex, bytes_regex
+
+
+# Bytes that make a bytes scan differ from text mode: a bytes pattern's \w,
+# \d, . and case folding only know ASCII, and text mode turns \r\n and \r
+# into \n
+_NOT_PLAIN_ASCII = re.compile(rb'[\x80-\xff\r]')
+
+
+def scan_file(filepath: str, match, text_regex=None, bytes_regex=None) -> list:
+    """Return ``(line_number, line)`` for lines of one file where ``match(line)`` is true.
+
+    With ``text_regex`` the file is read whole and scanned in one regex pass;
+    files of MMAP_THRESHOLD bytes or more are scanned through a memory map
+    with ``bytes_regex`` instead, when they are plain ASCII with ``\n`` line
+    breaks. Unreadable or non-UTF-8 files are skipped without raising.
+    """
+    hits = []
+    try:
+        if bytes_regex is not None and os.path.getsize(filepath) >= MMAP_THRESHOLD:
+            with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _NOT_PLAIN_ASCII.search(mm) is None:
+                    hits.extend(scan_buffer(mm, bytes_regex, match))
+                    return hits
+                text = str(mm, 'utf-8')
+            if '\r' in text:
+                # Universal newlines, as in text mode
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            hits.extend(scan_buffer(text, text_regex, match))
+        elif text_regex is not None:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                hits.extend(scan_buffer(f.read(), text_regex, match))
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for i, line in enumerate(f, 1):
+                    if match(line):
+                        hits.append((i, line.strip()))
+    except (OSError, UnicodeDecodeError):
+        pass
+    return hits
+
+
+def scan_batch(filepaths: list, pattern: str, flags: int, anchored: bool, buffer_pattern) -> list:
+    """Scan a batch of files in a worker process, compiling the patterns there."""
+    matchers = compile_scan(pattern, flags, anchored, buffer_pattern)
+    return [(filepath, i, line) for filepath in filepaths for i, line in scan_file(filepath, *matchers)]
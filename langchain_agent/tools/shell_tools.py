@@ -1,10 +1,21 @@
 """Shell command execution tools using LangChain @tool decorator."""
 import subprocess
 import os
+import errno
+import re
 import platform
+import functools
+import time
 import shlex
+import shutil
 from langchain_core.tools import tool
 
+try:
+    import psutil
+except ImportError:
+    # Fall back to `ps` in a shell
+    psutil = None
+
 
 # Commands that are blocked for safety
 BLOCKED_PATTERNS = [
@@ -20,6 +31,29 @@ BLOCKED_PATTERNS = [
     "curl | sh",
 ]
 
+# Single pass over the command for any blocked substring
+_BLOCKED_RE = re.compile("|".join(map(re.escape, BLOCKED_PATTERNS)))
+
+# Anything the shell would expand, redirect or chain; such commands need sh
+_SHELL_SYNTAX_RE = re.compile(r'[|&;<>()$`\\*?\[\]{}~#!\n]')
+
+
+def _direct_argv(command: str) -> list[str] | None:
+    """Split ``command`` into an argv that can run without a shell, or return None.
+
+    Only plain commands qualify: no shell syntax, balanced quotes, and a
+    program found on PATH (so builtins and ``VAR=value cmd`` still go to sh).
+    """
+    if _SHELL_SYNTAX_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
 
 @tool
 def run_command(command: str, timeout: int = 30) -> str:
@@ -30,19 +64,28 @@ def run_command(command: str, timeout: int = 30) -> str:
         timeout: Maximum execution time in seconds (default: 30)
     """
     # Safety check
-    for pattern in BLOCKED_PATTERNS:
-        if pattern in command:
-            return f"Error: Command blocked for safety reasons. Pattern '{pattern}' is not allowed."
+    blocked = _BLOCKED_RE.search(command)
+    if blocked:
+        return f"Error: Command blocked for safety reasons. Pattern '{blocked.group()}' is not allowed."
     
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
+        # Plain commands skip the extra fork+exec of /bin/sh
+        argv = _direct_argv(command)
+        run = functools.partial(
+            subprocess.run,
             capture_output=True,
             text=True,
             timeout=timeout,
             cwd=os.getcwd(),
         )
+        try:
+            result = run(command if argv is None else argv, shell=argv is None)
+        except OSError as e:
+            # An executable script without a shebang line can't be exec'd
+            # directly, but sh runs it as a shell script
+            if argv is None or e.errno != errno.ENOEXEC:
+                raise
+            result = run(command, shell=True)
         
         output_parts = []
         if result.stdout:
@@ -62,9 +105,9 @@ def run_command(command: str, timeout: int = 30) -> str:
         return f"Error executing command: {e}"
 
 
-@tool
-def get_environment() -> str:
-    """Get system environment information including OS, Python version, shell, and user."""
+@functools.cache
+def _static_environment() -> str:
+    """Environment details that can't change during the process lifetime."""
     info = [
         "System Environment:",
         f"  OS: {platform.system()} {platform.release()}",
@@ -74,15 +117,60 @@ def get_environment() -> str:
         f"  Shell: {os.environ.get('SHELL', 'unknown')}",
         f"  User: {os.environ.get('USER', 'unknown')}",
         f"  Home: {os.path.expanduser('~')}",
-        f"  CWD: {os.getcwd()}",
     ]
     return "\n".join(info)
 
 
+@tool
+def get_environment() -> str:
+    """Get system environment information including OS, Python version, shell, and user."""
+    # The working directory can change between calls, so it isn't cached
+    return f"{_static_environment()}\n  CWD: {os.getcwd()}"
+
+
+PROCESS_LIMIT = 14
+_PROCESS_ATTRS = ['pid', 'username', 'cpu_percent', 'memory_percent', 'name']
+_CPU_SAMPLE_SECONDS = 0.1
+_cpu_primed = False
+
+
+def _psutil_process_table() -> str:
+    """Top processes by CPU from one in-process sweep, formatted like ``ps``.
+
+    process_iter() reuses its Process objects between calls, so CPU usage is
+    measured since the previous call. The first call primes the counters and
+    samples for a short interval so it doesn't report 0.0 everywhere.
+    """
+    global _cpu_primed
+    if not _cpu_primed:
+        for p in psutil.process_iter(['cpu_percent']):
+            pass
+        time.sleep(_CPU_SAMPLE_SECONDS)
+        _cpu_primed = True
+    
+    procs = sorted(
+        (p.info for p in psutil.process_iter(_PROCESS_ATTRS)),
+        key=lambda info: info['cpu_percent'] or 0.0,
+        reverse=True,
+    )[:PROCESS_LIMIT]
+    
+    rows = [f"{'USER':<12} {'PID':>7} {'%CPU':>5} {'%MEM':>5} COMMAND"]
+    for info in procs:
+        rows.append(
+            f"{(info['username'] or '?')[:12]:<12} {info['pid']:>7} "
+            f"{info['cpu_percent'] or 0.0:>5.1f} {info['memory_percent'] or 0.0:>5.1f} "
+            f"{info['name'] or '?'}"
+        )
+    return "\n".join(rows) + "\n"
+
+
 @tool
 def get_process_list() -> str:
     """Get a list of running processes sorted by CPU usage."""
     try:
+        if psutil is not None:
+            return f"Top Processes:\n{_psutil_process_table()}"
+        
         result = subprocess.run(
             "ps aux --sort=-%cpu | head -15",
             shell=True,
@@ -102,19 +190,10 @@ def check_command_exists(command: str) -> str:
     Args:
         command: Command name to check
     """
-    try:
-        result = subprocess.run(
-            f"which {shlex.quote(command)}",
-            shell=True,
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode == 0:
-            return f"Command '{command}' exists at: {result.stdout.strip()}"
-        else:
-            return f"Command '{command}' not found in PATH"
-    except Exception as e:
-        return f"Error checking command: {e}"
+    path = shutil.which(command)
+    if path:
+        return f"Command '{command}' exists at: {path}"
+    return f"Command '{command}' not found in PATH"
 
 
 # Export all tools
@@ -1,13 +1,229 @@
 """General-purpose utility tools using LangChain @tool decorator."""
 import math
+import operator
+import functools
+import itertools
 import json
 import uuid
 import hashlib
-import base64
+import binascii
 import ast
 from datetime import datetime
 from langchain_core.tools import tool
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+# Hash constructors by name; the non-cryptographic ones only when installed
+HASH_ALGORITHMS = {
+    'md5': hashlib.md5,
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'sha512': hashlib.sha512,
+    'blake2b': hashlib.blake2b,
+}
+if xxhash is not None:
+    HASH_ALGORITHMS['xxh3'] = xxhash.xxh3_64
+    HASH_ALGORITHMS['xxh128'] = xxhash.xxh3_128
+if blake3 is not None:
+    HASH_ALGORITHMS['blake3'] = blake3.blake3
+
+# Texts longer than this are encoded and hashed a chunk at a time
+_HASH_STREAM_THRESHOLD = 1 << 20
+_HASH_CHUNK = 1 << 16
+
+
+# Names and operators allowed in calculate(); anything else is rejected
+_CALC_NAMES = {
+    'abs': abs,
+    'round': round,
+    'min': min,
+    'max': max,
+    'pow': pow,
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'log': math.log,
+    'log10': math.log10,
+    'exp': math.exp,
+    'pi': math.pi,
+    'e': math.e,
+    'floor': math.floor,
+    'ceil': math.ceil,
+}
+_CALC_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_CALC_UNARYOPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+# Bounds on what one operation may build; bigger integers take minutes to
+# compute and huge lists exhaust memory, so they are refused up front.
+# The bit bound stays well under the 4300 digits int -> str conversion
+# allows by default, so every result can be printed
+_CALC_MAX_BITS = 1 << 13
+_CALC_MAX_ITEMS = 1 << 20
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_expression(expression: str) -> ast.expr:
+    return ast.parse(expression.strip(), mode='eval').body
+
+
+def _eval_node(node):
+    handler = _CALC_NODES.get(type(node))
+    if handler is None:
+        raise ValueError(f"unsupported syntax '{type(node).__name__}'")
+    return handler(node)
+
+
+def _eval_constant(node: ast.Constant):
+    if type(node.value) not in (int, float, complex):
+        raise ValueError(f"unsupported constant {node.value!r}")
+    return node.value
+
+
+def _eval_name(node: ast.Name):
+    try:
+        return _CALC_NAMES[node.id]
+    except KeyError:
+        raise ValueError(f"unknown name '{node.id}'") from None
+
+
+def _check_pow(base, exponent):
+    """Refuse an integer power whose result would exceed ``_CALC_MAX_BITS``."""
+    if type(base) is int and type(exponent) is int and exponent > 0 and abs(base) > 1:
+        if abs(base).bit_length() * exponent > _CALC_MAX_BITS:
+            raise ValueError(f"result of {_describe(base)} ** {exponent} would be too large")
+
+
+def _count_items(value, seen: dict) -> int:
+    """Items in ``value`` including those of nested lists, a shared one counted at every use."""
+    if not isinstance(value, list):
+        return 0
+    key = id(value)
+    if key not in seen:
+        seen[key] = len(value) + sum(_count_items(item, seen) for item in value)
+    return seen[key]
+
+
+def _check_items(*parts, count: int = 1):
+    """Refuse a list built from ``parts`` (``count`` times over) that would exceed ``_CALC_MAX_ITEMS``."""
+    seen = {}
+    if sum(_count_items(part, seen) for part in parts) * count > _CALC_MAX_ITEMS:
+        raise ValueError("resulting list would be too large")
+
+
+def _check_mul(left, right):
+    """Refuse a product or list repetition that would exceed the size bounds."""
+    if type(left) is int and type(right) is int:
+        if left.bit_length() + right.bit_length() > _CALC_MAX_BITS:
+            raise ValueError("result of the multiplication would be too large")
+    elif isinstance(left, list) and type(right) is int or isinstance(right, list) and type(left) is int:
+        seq, count = (left, right) if isinstance(left, list) else (right, left)
+        _check_items(seq, count=count)
+
+
+def _check_add(left, right):
+    """Refuse a list concatenation that would exceed ``_CALC_MAX_ITEMS``."""
+    if isinstance(left, list) and isinstance(right, list):
+        _check_items(left, right)
+
+
+def _sum(iterable, start=0):
+    """sum() that joins lists in linear time and within ``_CALC_MAX_ITEMS``.
+
+    The builtin copies the running total on every step, so summing lists is
+    quadratic and its result is never size-checked.
+    """
+    if not isinstance(start, list):
+        return sum(iterable, start)
+    parts = list(iterable)
+    for part in parts:
+        if not isinstance(part, list):
+            raise TypeError(f'can only concatenate list (not "{type(part).__name__}") to list')
+    _check_items(start, *parts)
+    return list(itertools.chain(start, *parts))
+
+
+def _describe(value) -> str:
+    # Large bases are summarized; they can't be converted to text anyway
+    return str(value) if abs(value).bit_length() <= 64 else f"a {abs(value).bit_length()}-bit number"
+
+
+def _eval_binop(node: ast.BinOp):
+    op = _CALC_BINOPS.get(type(node.op))
+    if op is None:
+        raise ValueError(f"unsupported operator '{type(node.op).__name__}'")
+    left, right = _eval_node(node.left), _eval_node(node.right)
+    if op is operator.pow:
+        _check_pow(left, right)
+    elif op is operator.mul:
+        _check_mul(left, right)
+    elif op is operator.add:
+        _check_add(left, right)
+    return op(left, right)
+
+
+def _eval_unaryop(node: ast.UnaryOp):
+    op = _CALC_UNARYOPS.get(type(node.op))
+    if op is None:
+        raise ValueError(f"unsupported operator '{type(node.op).__name__}'")
+    return op(_eval_node(node.operand))
+
+
+def _eval_call(node: ast.Call):
+    if not isinstance(node.func, ast.Name) or node.keywords:
+        raise ValueError("only calls like sqrt(x) are allowed")
+    func = _eval_name(node.func)
+    if not callable(func):
+        raise ValueError(f"'{node.func.id}' is not a function")
+    args = [_eval_node(arg) for arg in node.args]
+    if func is pow and len(args) == 2:
+        # Three-argument pow is modular, so its result stays small
+        _check_pow(*args)
+    return func(*args)
+
+
+def _eval_sequence(node):
+    items = [_eval_node(elt) for elt in node.elts]
+    _check_items(items)
+    return items
+
+
+_CALC_NODES = {
+    ast.Constant: _eval_constant,
+    ast.Name: _eval_name,
+    ast.BinOp: _eval_binop,
+    ast.UnaryOp: _eval_unaryop,
+    ast.Call: _eval_call,
+    ast.List: _eval_sequence,
+    ast.Tuple: _eval_sequence,
+}
+# Registered here, once defined; the builtin sum() can't be bounded
+_CALC_NAMES['sum'] = _sum
+
 
 @tool
 def calculate(expression: str) -> str:
@@ -16,31 +232,8 @@ def calculate(expression: str) -> str:
     Args:
         expression: Mathematical expression to evaluate
     """
-    safe_dict = {
-        'abs': abs,
-        'round': round,
-        'min': min,
-        'max': max,
-        'sum': sum,
-        'pow': pow,
-        'sqrt': math.sqrt,
-        'sin': math.sin,
-        'cos': math.cos,
-        'tan': math.tan,
-        'log': math.log,
-        'log10': math.log10,
-        'exp': math.exp,
-        'pi': math.pi,
-        'e': math.e,
-        'floor': math.floor,
-        'ceil': math.ceil,
-    }
-    
     try:
-        if any(c in expression for c in ['import', 'exec', 'eval', 'open', '__']):
-            return "Error: Expression contains forbidden keywords"
-        
-        result = eval(expression, {"__builtins__": {}}, safe_dict)
+        result = _eval_node(_parse_expression(expression))
         return f"Result: {expression} = {result}"
     except ZeroDivisionError:
         return "Error: Division by zero"
@@ -74,6 +267,21 @@ def generate_uuid() -> str:
     return f"Generated UUID: {new_uuid}"
 
 
+def _json_pretty(value) -> str:
+    """Serialize ``value`` as JSON indented by two spaces.
+
+    json drops to its pure-Python encoder when indenting, so orjson is used
+    when installed.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            # Non-str keys, integers beyond 64 bits and the like
+            pass
+    return json.dumps(value, indent=2)
+
+
 @tool
 def json_parse(text: str) -> str:
     """Parse and pretty-print a JSON string.
@@ -83,7 +291,11 @@ def json_parse(text: str) -> str:
     """
     try:
         parsed = json.loads(text)
-        formatted = json.dumps(parsed, indent=2)
+        if 'NaN' in text or 'Infinity' in text:
+            # orjson would write non-finite floats as null
+            formatted = json.dumps(parsed, indent=2)
+        else:
+            formatted = _json_pretty(parsed)
         return f"Parsed JSON:\n```json\n{formatted}\n```"
     except json.JSONDecodeError as e:
         return f"Invalid JSON: {e}"
@@ -97,8 +309,12 @@ def json_create(data: str) -> str:
         data: Python dictionary-like string
     """
     try:
-        parsed = ast.literal_eval(data)
-        json_str = json.dumps(parsed, indent=2)
+        try:
+            # Input that is already JSON takes the fast path
+            parsed = json.loads(data)
+        except json.JSONDecodeError:
+            parsed = ast.literal_eval(data)
+        json_str = _json_pretty(parsed)
         return f"Created JSON:\n```json\n{json_str}\n```"
     except Exception as e:
         return f"Error creating JSON: {e}"
@@ -108,23 +324,27 @@ def json_create(data: str) -> str:
 def hash_text(text: str, algorithm: str = "sha256") -> str:
     """Calculate hash of text.
     
+    Use xxh3/xxh128 (if installed) or blake2b for checksums, dedupe and cache
+    keys; they are much faster than the SHA family on short strings. Keep
+    sha256 when the digest must be cryptographic.
+    
     Args:
         text: Text to hash
-        algorithm: Hash algorithm (md5, sha1, sha256, sha512)
+        algorithm: Hash algorithm (md5, sha1, sha256, sha512, blake2b, and xxh3, xxh128, blake3 when installed)
     """
-    algorithms = {
-        'md5': hashlib.md5,
-        'sha1': hashlib.sha1,
-        'sha256': hashlib.sha256,
-        'sha512': hashlib.sha512,
-    }
+    hasher = HASH_ALGORITHMS.get(algorithm.lower())
+    if hasher is None:
+        return f"Error: Unknown algorithm '{algorithm}'. Use: {', '.join(HASH_ALGORITHMS)}"
     
-    if algorithm.lower() not in algorithms:
-        return f"Error: Unknown algorithm '{algorithm}'. Use: {', '.join(algorithms.keys())}"
+    if len(text) <= _HASH_STREAM_THRESHOLD:
+        return f"{algorithm.upper()} hash: {hasher(text.encode('utf-8')).hexdigest()}"
     
-    hasher = algorithms[algorithm.lower()]()
-    hasher.update(text.encode('utf-8'))
-    return f"{algorithm.upper()} hash: {hasher.hexdigest()}"
+    # Avoid holding a full encoded copy of a large text; slicing a str never
+    # splits a code point, so the digest is the same
+    h = hasher()
+    for i in range(0, len(text), _HASH_CHUNK):
+        h.update(text[i:i + _HASH_CHUNK].encode('utf-8'))
+    return f"{algorithm.upper()} hash: {h.hexdigest()}"
 
 
 @tool
@@ -134,7 +354,7 @@ def base64_encode(text: str) -> str:
     Args:
         text: Text to encode
     """
-    encoded = base64.b64encode(text.encode('utf-8')).decode('utf-8')
+    encoded = binascii.b2a_base64(text.encode('utf-8'), newline=False).decode('ascii')
     return f"Base64 encoded:\n{encoded}"
 
 
@@ -146,7 +366,7 @@ def base64_decode(text: str) -> str:
         text: Base64 string to decode
     """
     try:
-        decoded = base64.b64decode(text.encode('utf-8')).decode('utf-8')
+        decoded = binascii.a2b_base64(text.encode('utf-8')).decode('utf-8')
         return f"Decoded text:\n{decoded}"
     except Exception as e:
         return f"Error decoding base64: {e}"
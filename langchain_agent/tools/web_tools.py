@@ -2,8 +2,185 @@
 import urllib.request
 import urllib.error
 import re
+import time
+import zlib
+import functools
+import threading
+import contextlib
+from itertools import chain
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.tools import tool
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    lxml_html = None
+except ImportError:
+    # lxml ships with duckduckgo-search; regexes are the last resort
+    HTMLParser = None
+    try:
+        import lxml.html as lxml_html
+        from lxml.etree import Comment as _lxml_comment
+    except ImportError:
+        lxml_html = None
+
+
+def _ttl_memoize(maxsize: int = 512, ttl: float = 600):
+    """Memoize a function's results by positional args for ``ttl`` seconds, LRU-bounded.
+
+    Exceptions aren't cached, so a failed request is retried on the next call.
+    Repeated queries during one reasoning session then skip the network and
+    don't count against DuckDuckGo's rate limits.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(args)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(args)
+                    return entry[1]
+            
+            value = func(*args)
+            with lock:
+                cache[args] = (now + ttl, value)
+                cache.move_to_end(args)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+# DDGS class, imported on first search since duckduckgo_search is slow to import
+_DDGS = None
+# Idle DDGS clients, each keeping its HTTP session and connections alive
+_DDGS_IDLE: list = []
+
+
+def _ddgs_class():
+    """Return the DDGS class, importing duckduckgo_search once."""
+    global _DDGS
+    if _DDGS is None:
+        from duckduckgo_search import DDGS
+        _DDGS = DDGS
+    return _DDGS
+
+
+@contextlib.contextmanager
+def _ddgs_client():
+    """Check out a DDGS client, reusing an idle one so TLS sessions are kept.
+
+    Clients are checked out exclusively, so concurrent searches never share
+    one. A client whose search raised is dropped, so a rate-limited session
+    is replaced with a fresh one.
+    """
+    try:
+        ddgs = _DDGS_IDLE.pop()
+    except IndexError:
+        ddgs = _ddgs_class()()
+    # DDGS paces requests on one client; each call used to get a fresh
+    # client, so don't carry that delay over from the previous call
+    ddgs.sleep_timestamp = 0.0
+    yield ddgs
+    _DDGS_IDLE.append(ddgs)
+
+
+@_ttl_memoize()
+def _ddgs_search(method: str, query: str, max_results) -> tuple:
+    """Run one DDGS query; ``method`` is text, news, images, videos, maps or answers."""
+    with _ddgs_client() as ddgs:
+        search = getattr(ddgs, method)
+        if max_results is None:
+            return tuple(search(query))
+        return tuple(search(query, max_results=max_results))
+
+
+def _web_row(i: int, r: dict) -> str:
+    return (
+        f"{i}. **{r.get('title', 'No title')}**\n"
+        f"   URL: {r.get('href', 'N/A')}\n"
+        f"   {r.get('body', '')}\n"
+    )
+
+
+def _news_row(i: int, r: dict) -> str:
+    return (
+        f"{i}. **{r.get('title', 'No title')}**\n"
+        f"   Source: {r.get('source', 'Unknown')} | {r.get('date', 'No date')}\n"
+        f"   URL: {r.get('url', 'N/A')}\n"
+        f"   {r.get('body', '')}\n"
+    )
+
+
+def _image_row(i: int, r: dict) -> str:
+    return (
+        f"{i}. **{r.get('title', 'No title')}**\n"
+        f"   Image: {r.get('image', 'N/A')}\n"
+        f"   Source: {r.get('url', 'N/A')}\n"
+        f"   Size: {r.get('width', '?')}x{r.get('height', '?')}\n"
+    )
+
+
+def _video_row(i: int, r: dict) -> str:
+    return (
+        f"{i}. **{r.get('title', 'No title')}**\n"
+        f"   Publisher: {r.get('publisher', 'Unknown')} | Duration: {r.get('duration', 'N/A')}\n"
+        f"   URL: {r.get('content', 'N/A')}\n"
+    )
+
+
+def _place_row(i: int, r: dict) -> str:
+    return (
+        f"{i}. **{r.get('title', 'No name')}**\n"
+        f"   Address: {r.get('address', 'N/A')}\n"
+        f"   Phone: {r.get('phone', 'N/A')}\n"
+        + (f"   Website: {r['url']}\n" if r.get('url') else "")
+    )
+
+
+def _answer_row(i: int, r: dict) -> str:
+    return (
+        f"**{r.get('text', 'No answer')}**\n"
+        + (f"Source: {r['url']}\n" if r.get('url') else "")
+    )
+
+
+# DDGS method -> (header, no-results message, error prefix, row formatter)
+_SEARCH_FORMATS = {
+    "text": ("Search results for '{query}':\n", "No results found for: '{query}'", "Search error", _web_row),
+    "news": ("News results for '{query}':\n", "No news found for: '{query}'", "News search error", _news_row),
+    "images": ("Image results for '{query}':\n", "No images found for: '{query}'", "Image search error", _image_row),
+    "videos": ("Video results for '{query}':\n", "No videos found for: '{query}'", "Video search error", _video_row),
+    "maps": ("Places for '{query}':\n", "No places found for: '{query}'", "Maps search error", _place_row),
+    "answers": ("Answers for '{query}':\n", "No instant answer for: '{query}'", "Answers error", _answer_row),
+}
+
+
+def _run_search(method: str, query: str, max_results, shown: int | None = None) -> str:
+    """Run a DDGS search and format up to ``shown`` results for the model.
+
+    Shared by all search tools, which differ only in the method called and
+    the format table entry above.
+    """
+    header, empty, error, row = _SEARCH_FORMATS[method]
+    try:
+        results = _ddgs_search(method, query.strip(), max_results)
+        
+        if not results:
+            return empty.format(query=query)
+        
+        rows = (row(i, r) for i, r in enumerate(results[:shown], 1))
+        return "\n".join(chain([header.format(query=query)], rows))
+    except Exception as e:
+        return f"{error}: {e}"
+
 
 @tool
 def web_search(query: str, num_results: int = 5) -> str:
@@ -13,24 +190,33 @@ def web_search(query: str, num_results: int = 5) -> str:
         query: Search query string
         num_results: Number of results (default: 5)
     """
-    try:
-        from duckduckgo_search import DDGS
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=num_results))
-        
-        if not results:
-            return f"No results found for: '{query}'"
-        
-        output = [f"Search results for '{query}':\n"]
-        for i, r in enumerate(results, 1):
-            output.append(f"{i}. **{r.get('title', 'No title')}**")
-            output.append(f"   URL: {r.get('href', 'N/A')}")
-            output.append(f"   {r.get('body', '')}\n")
-        
-        return "\n".join(output)
-    except Exception as e:
-        return f"Search error: {e}"
+    return _run_search("text", query, num_results)
+
+
+@tool
+def multi_search(queries: list[str], num_results: int = 3) -> str:
+    """Run several web searches at once. Faster than separate web_search calls.
+    
+    Args:
+        queries: Search query strings (up to 5)
+        num_results: Number of results per query (default: 3)
+    """
+    queries = queries[:5]
+    if not queries:
+        return "Error: No queries given"
+    
+    # DDGS is blocking, so overlap the requests on threads
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        results = list(pool.map(
+            lambda q: web_search.invoke({"query": q, "num_results": num_results}),
+            queries,
+        ))
+    
+    output = [f"**Searched {len(queries)} queries**\n"]
+    for query, result in zip(queries, results):
+        output.append(f"### {query}\n{result}")
+    
+    return "\n".join(output)
 
 
 @tool
@@ -41,25 +227,7 @@ def news_search(query: str, num_results: int = 5) -> str:
         query: News topic to search for
         num_results: Number of results (default: 5)
     """
-    try:
-        from duckduckgo_search import DDGS
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.news(query, max_results=num_results))
-        
-        if not results:
-            return f"No news found for: '{query}'"
-        
-        output = [f"News results for '{query}':\n"]
-        for i, r in enumerate(results, 1):
-            output.append(f"{i}. **{r.get('title', 'No title')}**")
-            output.append(f"   Source: {r.get('source', 'Unknown')} | {r.get('date', 'No date')}")
-            output.append(f"   URL: {r.get('url', 'N/A')}")
-            output.append(f"   {r.get('body', '')}\n")
-        
-        return "\n".join(output)
-    except Exception as e:
-        return f"News search error: {e}"
+    return _run_search("news", query, num_results)
 
 
 @tool
@@ -70,25 +238,7 @@ def image_search(query: str, num_results: int = 5) -> str:
         query: Image search query
         num_results: Number of results (default: 5)
     """
-    try:
-        from duckduckgo_search import DDGS
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.images(query, max_results=num_results))
-        
-        if not results:
-            return f"No images found for: '{query}'"
-        
-        output = [f"Image results for '{query}':\n"]
-        for i, r in enumerate(results, 1):
-            output.append(f"{i}. **{r.get('title', 'No title')}**")
-            output.append(f"   Image: {r.get('image', 'N/A')}")
-            output.append(f"   Source: {r.get('url', 'N/A')}")
-            output.append(f"   Size: {r.get('width', '?')}x{r.get('height', '?')}\n")
-        
-        return "\n".join(output)
-    except Exception as e:
-        return f"Image search error: {e}"
+    return _run_search("images", query, num_results)
 
 
 @tool
@@ -99,24 +249,7 @@ def video_search(query: str, num_results: int = 5) -> str:
         query: Video search query
         num_results: Number of results (default: 5)
     """
-    try:
-        from duckduckgo_search import DDGS
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.videos(query, max_results=num_results))
-        
-        if not results:
-            return f"No videos found for: '{query}'"
-        
-        output = [f"Video results for '{query}':\n"]
-        for i, r in enumerate(results, 1):
-            output.append(f"{i}. **{r.get('title', 'No title')}**")
-            output.append(f"   Publisher: {r.get('publisher', 'Unknown')} | Duration: {r.get('duration', 'N/A')}")
-            output.append(f"   URL: {r.get('content', 'N/A')}\n")
-        
-        return "\n".join(output)
-    except Exception as e:
-        return f"Video search error: {e}"
+    return _run_search("videos", query, num_results)
 
 
 @tool
@@ -127,29 +260,81 @@ def maps_search(query: str, place: str = "") -> str:
         query: What to search for (e.g., "restaurants", "hotels")
         place: Location to search in (e.g., "New York", "London")
     """
-    try:
-        from duckduckgo_search import DDGS
-        
-        full_query = f"{query} {place}".strip()
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.maps(full_query, max_results=5))
-        
-        if not results:
-            return f"No places found for: '{full_query}'"
-        
-        output = [f"Places for '{full_query}':\n"]
-        for i, r in enumerate(results, 1):
-            output.append(f"{i}. **{r.get('title', 'No name')}**")
-            output.append(f"   Address: {r.get('address', 'N/A')}")
-            output.append(f"   Phone: {r.get('phone', 'N/A')}")
-            if r.get('url'):
-                output.append(f"   Website: {r.get('url')}")
-            output.append("")
-        
-        return "\n".join(output)
-    except Exception as e:
-        return f"Maps search error: {e}"
+    return _run_search("maps", f"{query} {place}".strip(), 5)
+
+
+# Raw bytes read per character of text kept, with a floor so pages with a
+# large <head> (inline scripts, styles, SVG) still reach their body text
+FETCH_OVERSAMPLE = 8
+FETCH_MIN_BYTES = 512 * 1024
+_FETCH_CHUNK = 16384
+
+# Fallback HTML stripping when no parser is installed
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _read_capped(response, limit: int) -> bytes:
+    """Read at most ``limit`` bytes of a response body, decompressing gzip on the fly."""
+    gzipped = response.headers.get('Content-Encoding', '').lower() == 'gzip'
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+    
+    body = bytearray()
+    while len(body) < limit:
+        chunk = response.read(_FETCH_CHUNK)
+        if not chunk:
+            break
+        if decoder is not None:
+            chunk = decoder.decompress(chunk, limit - len(body))
+        body += chunk
+    return bytes(body[:limit])
+
+
+def _html_to_text(html: str) -> str:
+    """Return the text of an HTML page without scripts, styles or tags, whitespace collapsed.
+
+    Uses a C HTML parser (selectolax, else lxml) when available, which is a
+    single linear pass instead of several regex substitutions over the page.
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        tree.strip_tags(['script', 'style'])
+        text = tree.text(separator=' ')
+    elif lxml_html is not None:
+        try:
+            doc = lxml_html.document_fromstring(html)
+        except Exception:
+            # Empty or unparseable documents have no text
+            return ''
+        for element in list(doc.iter('script', 'style', _lxml_comment)):
+            element.drop_tree()
+        text = ' '.join(doc.itertext())
+    else:
+        text = _TAG_RE.sub(' ', _SCRIPT_STYLE_RE.sub('', html))
+    
+    return ' '.join(text.split())
+
+
+@_ttl_memoize(maxsize=128)
+def _fetch_text(url: str, max_length: int) -> str:
+    """Fetch a URL and return its visible text, truncated to ``max_length``."""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+        'Accept-Encoding': 'gzip',
+    }
+    req = urllib.request.Request(url, headers=headers)
+    
+    # Only read as much of the page as could fill max_length
+    limit = max(max_length * FETCH_OVERSAMPLE, FETCH_MIN_BYTES)
+    with urllib.request.urlopen(req, timeout=10) as response:
+        content = _read_capped(response, limit).decode('utf-8', errors='ignore')
+    
+    content = _html_to_text(content)
+    
+    if len(content) > max_length:
+        content = content[:max_length] + "... (truncated)"
+    
+    return content
 
 
 @tool
@@ -161,22 +346,7 @@ def fetch_url(url: str, max_length: int = 5000) -> str:
         max_length: Max content length (default: 5000)
     """
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'}
-        req = urllib.request.Request(url, headers=headers)
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            content = response.read().decode('utf-8', errors='ignore')
-        
-        # Remove scripts/styles and HTML tags
-        content = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<[^>]+>', ' ', content)
-        content = re.sub(r'\s+', ' ', content).strip()
-        
-        if len(content) > max_length:
-            content = content[:max_length] + "... (truncated)"
-        
-        return f"Content from {url}:\n\n{content}"
+        return f"Content from {url}:\n\n{_fetch_text(url, max_length)}"
     except Exception as e:
         return f"Fetch error: {e}"
 
@@ -188,30 +358,13 @@ def answers_search(query: str) -> str:
     Args:
         query: Question or topic to get an instant answer for
     """
-    try:
-        from duckduckgo_search import DDGS
-        
-        with DDGS() as ddgs:
-            results = list(ddgs.answers(query))
-        
-        if not results:
-            return f"No instant answer for: '{query}'"
-        
-        output = [f"Answers for '{query}':\n"]
-        for r in results[:3]:
-            output.append(f"**{r.get('text', 'No answer')}**")
-            if r.get('url'):
-                output.append(f"Source: {r.get('url')}")
-            output.append("")
-        
-        return "\n".join(output)
-    except Exception as e:
-        return f"Answers error: {e}"
+    return _run_search("answers", query, None, shown=3)
 
 
 # Export all tools - all free, no API keys needed
 WEB_TOOLS = [
     web_search,
+    multi_search,
     news_search, 
     image_search,
     video_search,
@@ -11,6 +11,7 @@ from training data. They don't need verbose schemas in every request.
 TOOL_CATALOGUE = {
     # File operations
     "read_file": "Read file contents",
+    "read_files": "Read several files at once",
     "write_file": "Write content to file (overwrite)",
     "replace_in_file": "Replace text in file",
     "insert_in_file": "Insert text/lines in file",
@@ -40,19 +41,22 @@ TOOL_CATALOGUE = {
 }
 
 
+# The catalogue is a constant, so its prompt text is rendered once at import
+_CATALOGUE_PROMPT = "Available tools:\n" + "\n".join(
+    f"  {name}: {desc}" for name, desc in TOOL_CATALOGUE.items()
+)
+# Rough estimate: ~4 chars per token
+_CATALOGUE_TOKENS = len(_CATALOGUE_PROMPT) // 4
+
+
 def get_catalogue_prompt() -> str:
     """Format catalogue as minimal prompt text."""
-    lines = ["Available tools:"]
-    for name, desc in TOOL_CATALOGUE.items():
-        lines.append(f"  {name}: {desc}")
-    return "\n".join(lines)
+    return _CATALOGUE_PROMPT
 
 
 def get_catalogue_tokens() -> int:
     """Estimate token count of catalogue."""
-    text = get_catalogue_prompt()
-    # Rough estimate: ~4 chars per token
-    return len(text) // 4
+    return _CATALOGUE_TOKENS
 
 
 # Tool execution specs - used by subagent, NOT sent to main agent
@@ -62,6 +66,11 @@ TOOL_SPECS = {
         "params": ["path"],
         "filterable_fields": ["content", "size", "error"],
     },
+    "read_files": {
+        "function": "tools.file_tools.read_files",
+        "params": ["paths", "max_bytes"],
+        "filterable_fields": ["files", "count", "error"],
+    },
     "write_file": {
         "function": "tools.file_tools.write_file",
         "params": ["path", "content"],
@@ -1,11 +1,15 @@
 """LEAP Agent CLI - Interactive interface."""
 import sys
+import json
+import time
 import readline
+import threading
+import contextlib
 from typing import Optional
 
-from .orchestrator import LEAPOrchestrator
 from .config import LEAPConfig, MODEL_PAIRS
-from .inference import test_ollama_connection
+
+HISTORY_FILE = ".leap_history"
 
 
 class Colors:
@@ -25,8 +29,7 @@ def print_colored(text: str, color: str = Colors.RESET, bold: bool = False):
     print(f"{prefix}{color}{text}{Colors.RESET}")
 
 
-def print_banner():
-    banner = """
+_BANNER = f"""{Colors.BOLD}{Colors.CYAN}
 ╔═══════════════════════════════════════════════════════════════╗
 ║                                                               ║
 ║   ██╗     ███████╗ █████╗ ██████╗                             ║
@@ -39,8 +42,11 @@ def print_banner():
 ║   Lightweight Edge Agent Protocol                             ║
 ║   Optimized for 4GB VRAM • Sequential Orchestration           ║
 ╚═══════════════════════════════════════════════════════════════╝
-"""
-    print_colored(banner, Colors.CYAN, bold=True)
+{Colors.RESET}"""
+
+
+def print_banner():
+    print(_BANNER)
 
 
 def print_help():
@@ -57,14 +63,28 @@ Commands:
     print_colored(help_text, Colors.YELLOW)
 
 
+def _load_history():
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except FileNotFoundError:
+        pass
+
+
 def run_cli(config: Optional[LEAPConfig] = None):
     """Run interactive LEAP CLI."""
     config = config or LEAPConfig()
     
     print_banner()
     
+    # Load command history while Ollama is probed and the agent starts
+    history_loader = threading.Thread(target=_load_history, daemon=True)
+    history_loader.start()
+    
+    from .inference import test_ollama_connection
+    from .orchestrator import LEAPOrchestrator
+    
     # Check Ollama connection
-    if not test_ollama_connection():
+    if not test_ollama_connection(config.ollama_host):
         print_colored("[ERROR] Ollama not running! Start with: ollama serve", Colors.RED)
         return 1
     
@@ -81,10 +101,7 @@ def run_cli(config: Optional[LEAPConfig] = None):
         return 1
     
     # Command history
-    try:
-        readline.read_history_file(".leap_history")
-    except FileNotFoundError:
-        pass
+    history_loader.join()
     
     while True:
         try:
@@ -166,12 +183,53 @@ def run_cli(config: Optional[LEAPConfig] = None):
     
     # Save history
     try:
-        readline.write_history_file(".leap_history")
+        readline.write_history_file(HISTORY_FILE)
     except:
         pass
     
     return 0
 
 
+def run_server(config: Optional[LEAPConfig] = None):
+    """Serve tasks over stdin/stdout as JSON lines.
+
+    Each input line is ``{"task": "..."}``; each reply is one JSON line with
+    the answer, elapsed time and orchestration metrics. Verbose agent output
+    goes to stderr so stdout only carries replies.
+    """
+    from .orchestrator import LEAPOrchestrator
+    
+    config = config or LEAPConfig()
+    out = sys.stdout
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        agent = LEAPOrchestrator(config)
+    
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        start = time.perf_counter()
+        try:
+            task = json.loads(line)["task"]
+            with contextlib.redirect_stdout(sys.stderr):
+                response = agent.run(task)
+            reply = {
+                "task": task,
+                "response": response,
+                "metrics": agent.get_metrics(),
+                "success": True,
+            }
+        except Exception as e:
+            reply = {"error": str(e), "success": False}
+        reply["elapsed"] = time.perf_counter() - start
+        
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+    
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(run_cli())
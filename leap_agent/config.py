@@ -1,6 +1,10 @@
 """LEAP Agent Configuration - optimized for 4GB VRAM."""
+import os
 from dataclasses import dataclass, field
 
+# Same default the ollama package uses, which honours OLLAMA_HOST
+DEFAULT_OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+
 
 @dataclass
 class LEAPConfig:
@@ -12,7 +16,8 @@ class LEAPConfig:
     sub_model: str = "gemma3:1b"      # 815MB - execution/filtering
     
     # Ollama settings
-    ollama_host: str = "http://localhost:11434"
+    ollama_host: str = DEFAULT_OLLAMA_HOST
+    keep_alive: str = "30m"           # Keep warmed-up models loaded this long
     
     # Temperature settings
     main_temperature: float = 0.3    # Lower for consistent tool selection
@@ -5,11 +5,19 @@ On 4GB VRAM, we can only have one model loaded at a time.
 """
 import ollama
 import time
-from typing import Optional, Generator
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Generator
 from dataclasses import dataclass
 from .config import LEAPConfig
 
 
+@functools.lru_cache(maxsize=None)
+def _shared_client(host: str) -> ollama.Client:
+    """One keep-alive HTTP client per Ollama server, shared by every call."""
+    return ollama.Client(host=host)
+
+
 @dataclass
 class InferenceMetrics:
     """Track inference performance."""
@@ -24,8 +32,10 @@ class OllamaInference:
     
     def __init__(self, config: LEAPConfig):
         self.config = config
+        self.client = _shared_client(config.ollama_host)
         self.current_model: Optional[str] = None
         self.metrics = InferenceMetrics()
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
         
     def generate(
         self,
@@ -38,8 +48,6 @@ class OllamaInference:
         """Generate response from a model.
         In sequential mode, this will unload previous model before loading new one.
         """
-        start = time.time()
-        
         # Track if model changed
         model_changed = model != self.current_model
         if model_changed and self.config.verbose:
@@ -49,7 +57,7 @@ class OllamaInference:
             if stream:
                 return self._stream_generate(model, prompt, temperature, max_tokens)
             else:
-                response = ollama.generate(
+                response = self.client.generate(
                     model=model,
                     prompt=prompt,
                     options={
@@ -59,19 +67,61 @@ class OllamaInference:
                 )
                 
                 self.current_model = model
-                self.metrics.inference_time = time.time() - start
-                self.metrics.tokens_generated = response.get('eval_count', 0)
-                
-                if self.metrics.inference_time > 0:
-                    self.metrics.tokens_per_second = (
-                        self.metrics.tokens_generated / self.metrics.inference_time
-                    )
+                self._record_metrics(response)
                 
                 return response['response']
                 
         except Exception as e:
             raise RuntimeError(f"Ollama inference failed: {e}")
     
+    def generate_until(
+        self,
+        model: str,
+        prompt: str,
+        stop: Callable[[str], bool],
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> str:
+        """Stream a generation and return the text as soon as ``stop(text)`` is true.
+        
+        Closing the stream early drops the HTTP connection, which makes
+        Ollama abort the rest of the generation.
+        """
+        if model != self.current_model and self.config.verbose:
+            print(f" Loading model: {model}")
+        
+        text = ""
+        tokens = 0
+        try:
+            stream = self.client.generate(
+                model=model,
+                prompt=prompt,
+                options={
+                    "temperature": temperature,
+                    "num_predict": max_tokens,
+                },
+                stream=True
+            )
+            try:
+                for chunk in stream:
+                    if chunk.get('done'):
+                        self._record_metrics(chunk)
+                        break
+                    if chunk.get('response'):
+                        text += chunk['response']
+                        tokens += 1
+                        if stop(text):
+                            # Stopped early, so no server timings arrive
+                            self.metrics = InferenceMetrics(tokens_generated=tokens)
+                            break
+            finally:
+                stream.close()
+        except Exception as e:
+            raise RuntimeError(f"Ollama inference failed: {e}")
+        
+        self.current_model = model
+        return text
+    
     def _stream_generate(
         self,
         model: str,
@@ -80,10 +130,7 @@ class OllamaInference:
         max_tokens: int
     ) -> Generator[str, None, None]:
         """Stream generation for real-time output."""
-        start = time.time()
-        total_tokens = 0
-        
-        for chunk in ollama.generate(
+        for chunk in self.client.generate(
             model=model,
             prompt=prompt,
             options={
@@ -93,14 +140,44 @@ class OllamaInference:
             stream=True
         ):
             if 'response' in chunk:
-                total_tokens += 1
                 yield chunk['response']
+            if chunk.get('done'):
+                # Only the final chunk carries the timings
+                self._record_metrics(chunk)
         
         self.current_model = model
-        self.metrics.inference_time = time.time() - start
-        self.metrics.tokens_generated = total_tokens
+    
+    def _record_metrics(self, response):
+        """Take metrics from Ollama's own timings (nanoseconds), which exclude
+        HTTP and decoding overhead on this side."""
+        self.metrics.load_time = (response.get('load_duration') or 0) / 1e9
+        self.metrics.inference_time = (response.get('eval_duration') or 0) / 1e9
+        self.metrics.tokens_generated = response.get('eval_count') or 0
         if self.metrics.inference_time > 0:
-            self.metrics.tokens_per_second = total_tokens / self.metrics.inference_time
+            self.metrics.tokens_per_second = (
+                self.metrics.tokens_generated / self.metrics.inference_time
+            )
+    
+    def prefetch(self, model: str):
+        """Start loading a model in the background, ahead of the call that needs it.
+
+        Lets a model swap overlap other work, such as running a tool. Ollama
+        queues the real request until the load finishes, so no waiting is
+        needed on this side.
+        """
+        if model == self.current_model:
+            return
+        if self._prefetcher is None:
+            self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ollama-prefetch")
+        self._prefetcher.submit(self._load_model, model)
+    
+    def _load_model(self, model: str):
+        try:
+            # An empty prompt only loads the model
+            self.client.generate(model=model, prompt="")
+        except Exception:
+            # Just a hint; the real call reports any error
+            pass
     
     def warmup(self):
         """Pre-load models into Ollama's cache."""
@@ -109,25 +186,26 @@ class OllamaInference:
             
         print(" Warming up models...")
         
-        # Quick generation to load models
-        start = time.time()
-        ollama.generate(
-            model=self.config.main_model,
-            prompt="Hello",
-            options={"num_predict": 1}
-        )
-        main_time = time.time() - start
+        # Quick generation to load models; both loads overlap, and Ollama
+        # queues the second itself if they don't fit in VRAM together
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            main = pool.submit(self._warm_model, self.config.main_model)
+            sub = pool.submit(self._warm_model, self.config.sub_model)
+            main_time, sub_time = main.result(), sub.result()
         
+        print(f" Models ready: {self.config.main_model}({main_time:.1f}s), "
+              f"{self.config.sub_model}({sub_time:.1f}s)")
+    
+    def _warm_model(self, model: str) -> float:
+        """Load a model with a 1-token generation; returns the seconds taken."""
         start = time.time()
-        ollama.generate(
-            model=self.config.sub_model,
+        self.client.generate(
+            model=model,
             prompt="Hello",
-            options={"num_predict": 1}
+            options={"num_predict": 1},
+            keep_alive=self.config.keep_alive,
         )
-        sub_time = time.time() - start
-        
-        print(f" Models ready: {self.config.main_model}({main_time:.1f}s), "
-              f"{self.config.sub_model}({sub_time:.1f}s)")
+        return time.time() - start
     
     def get_metrics(self) -> dict:
         """Get last inference metrics."""
@@ -138,19 +216,19 @@ class OllamaInference:
             "tok/s": round(self.metrics.tokens_per_second, 1),
         }
 
-def test_ollama_connection() -> bool:
+def test_ollama_connection(host: str = LEAPConfig.ollama_host) -> bool:
     """Test if Ollama is running."""
     try:
-        ollama.list()
+        _shared_client(host).list()
         return True
     except Exception:
         return False
 
 
-def list_available_models() -> list[str]:
+def list_available_models(host: str = LEAPConfig.ollama_host) -> list[str]:
     """List models available in Ollama."""
     try:
-        models = ollama.list()
+        models = _shared_client(host).list()
         return [m['name'] for m in models.get('models', [])]
     except Exception:
         return []
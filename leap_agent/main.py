@@ -3,7 +3,7 @@ import argparse
 import sys
 
 from .config import LEAPConfig, MODEL_PAIRS
-from .cli import run_cli
+from .cli import run_cli, run_server
 
 
 def main():
@@ -41,6 +41,11 @@ def main():
         "-c", "--command",
         help="Run single command and exit"
     )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Serve JSON-line tasks on stdin/stdout"
+    )
     parser.add_argument(
         "--list-tools",
         action="store_true",
@@ -74,6 +79,10 @@ def main():
             print(f"  • {tool}")
         return 0
     
+    # Persistent worker mode
+    if args.server:
+        return run_server(config)
+    
     # Single command mode
     if args.command:
         from .orchestrator import LEAPOrchestrator
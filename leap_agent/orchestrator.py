@@ -16,14 +16,288 @@ LEAP approach:
 import json
 import time
 import re
+import importlib
+from collections.abc import Mapping
 from typing import Optional
 from dataclasses import dataclass, field
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import LEAPConfig
 from .catalogue import get_catalogue_prompt, TOOL_SPECS
 from .inference import OllamaInference
 
 
+# Prompt templates, filled in with str.format
+_PLANNING_TEMPLATE = """You are an autonomous AI agent whose main job is to assist users with their tasks. 
+                     You are supposed to help them with their tasks using the following tools given to you.
+        
+        Tools: {catalogue}
+        
+        User request: {query}
+        
+        Current Progress:
+        {state}
+        
+        Which tool should be used NEXT? 
+        1. CRITICAL: You MUST think about the request first inside <think> tags.
+        2. Then reply with the JSON tool request.
+        
+        Which tool should be used NEXT? 
+        
+        Optional: You can explain your reasoning in <think> tags before the JSON.
+        Required: You MUST reply with the JSON tool request.
+        
+        Example:
+        <think>
+        I need to list files to see what's here.
+        </think>
+        {{"tool": "fs_list", "params": {{"path": "."}} }}
+        
+        Your answer:"""
+_UPDATE_STATE_TEMPLATE = """Update the progress summary for this task.
+        
+        User Request: {query}
+        
+        Old Summary:
+        {state}
+        
+        New Action: Used {tool}
+        Result: {result}
+        
+        Write a concise, updated summary of what has been done so far. 
+        Do not lose important details from the Old Summary.
+        Merge the New Action into the summary.
+        Keep it under 300 words.
+        
+        Updated Summary:"""
+_FINAL_ANSWER_TEMPLATE = """User query: {query}
+        Summary of actions taken:
+        {state}
+        
+        Based on this summary, provide the final answer to the user request.
+        If you created files or verified code, report what was done."""
+
+# The catalogue never changes, so it is baked into the planning prompt once
+_PLANNING_PROMPT = _PLANNING_TEMPLATE.replace(
+    "{catalogue}", get_catalogue_prompt().replace("{", "{{").replace("}", "}}")
+)
+
+# Tools with short, self-explanatory results; phase 3 appends a templated
+# line for them instead of asking the main model to rewrite the summary
+_TEMPLATED_STATE_TOOLS = frozenset({
+    "calculate",
+    "current_time",
+    "get_current_time",
+    "parse_json",
+    "file_info",
+    "list_directory",
+    "get_shell_env",
+})
+_INITIAL_STATE = "No actions taken yet."
+_TEMPLATED_RESULT_CHARS = 200
+
+# Filter output up to this size is extracted in Python, skipping the subagent
+_LOCAL_FILTER_CHARS = 2000
+
+# Hard cap on the rolling summary so the planning prompt stops growing with
+# each turn; the head keeps the original goal, the tail the latest actions
+_SUMMARY_CAP = 1500
+_SUMMARY_HEAD = 400
+_SUMMARY_TAIL = 1000
+_SUMMARY_MARKER = "\n...[truncated]...\n"
+
+# Whole queries whose first tool is obvious; phase 1 builds the request for
+# them directly instead of running the planning model
+_FAST_INTENTS = [
+    (
+        re.compile(r"(?:what(?:'s| is) the (?:current )?(?:time|date)(?: now| today)?"
+                   r"|what time is it(?: now)?|current (?:time|date))\s*[?.!]?", re.IGNORECASE),
+        lambda m: {"tool": "current_time", "params": {}},
+    ),
+    (
+        re.compile(r"(?:calculate|compute|evaluate)\s+([-+*/%().\d\s]*\d[-+*/%().\d\s]*?)\s*[?.!]?", re.IGNORECASE),
+        lambda m: {"tool": "calculate", "params": {"expression": m.group(1)}},
+    ),
+    (
+        # The path follows "in"/"of", or is a bare token that looks like one
+        # (".", "~/x", "src/"); a bare last word such as "here" or
+        # "recursively" is left to the planning model
+        re.compile(r"list (?:the )?(?:files|directory|contents)"
+                   r"(?: (?:in|of) (?!(?:here|there|this|that|it|the|my|current|all)\b)(\S+?)"
+                   r"| ((?:[./~]|[^\s/]*/)\S*?))[?!]?", re.IGNORECASE),
+        lambda m: {"tool": "list_directory", "params": {"path": m.group(1) or m.group(2)}},
+    ),
+]
+
+# Response post-processing
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+_THINK_BODY_RE = re.compile(r'<think>(.*?)</think>', re.DOTALL)
+_JSON_FENCE_RE = re.compile(r'```json\s*')
+_FENCE_RE = re.compile(r'```\s*')
+_OBJECT_START_RE = re.compile(r'\{')
+_VALUE_START_RE = re.compile(r'[\{\[]')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _cap_summary(summary: str) -> str:
+    """Keep the head and tail of a state summary longer than ``_SUMMARY_CAP``."""
+    if len(summary) <= _SUMMARY_CAP:
+        return summary
+    return summary[:_SUMMARY_HEAD] + _SUMMARY_MARKER + summary[-_SUMMARY_TAIL:]
+
+
+def _json_dumps(value) -> str:
+    """Serialize ``value`` as compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            # Non-str keys, integers beyond 64 bits and the like
+            pass
+    return json.dumps(value)
+
+
+# Longest list kept from a tool result
+_MAX_RESULT_ITEMS = 100
+
+
+def _cap_strings(value, limit: int):
+    """Copy of a tool result with strings cut to ``limit`` chars and lists to
+    ``_MAX_RESULT_ITEMS`` items, so serializing it is bounded."""
+    if isinstance(value, str):
+        return value[:limit] + "..." if len(value) > limit else value
+    if isinstance(value, dict):
+        return {k: _cap_strings(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_cap_strings(v, limit) for v in value[:_MAX_RESULT_ITEMS]]
+    return value
+
+
+def _estimate_json_chars(value) -> int:
+    """Length of ``value`` as compact JSON, counted without serializing it.
+
+    Exact for plain data apart from string escapes, which aren't counted.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        return max(2, 1 + sum(len(str(k)) + 4 + _estimate_json_chars(v) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return max(2, 1 + sum(_estimate_json_chars(v) + 1 for v in value))
+    return len(str(value))
+
+
+def _route_intent(query: str) -> Optional[dict]:
+    """Return the tool request for a query matching ``_FAST_INTENTS``, else None."""
+    query = query.strip()
+    for pattern, build in _FAST_INTENTS:
+        match = pattern.fullmatch(query)
+        if match is not None:
+            return build(match)
+    return None
+
+
+def _find_tool_request(text: str) -> Optional[dict]:
+    """Return the first JSON object in ``text`` that has a "tool" key."""
+    # A reply without a "tool" key can't hold a request, so it isn't
+    # scanned at all
+    if '"tool"' in text:
+        for parsed in _iter_json_values(text, _OBJECT_START_RE):
+            if isinstance(parsed, dict) and 'tool' in parsed:
+                return parsed
+    return None
+
+
+def _planning_done(text: str) -> bool:
+    """True once a streamed planning reply holds a complete tool request.
+    
+    Only checked when the text ends in a closing brace, and never inside an
+    unfinished <think> block, whose braces are just reasoning.
+    """
+    if not text.rstrip().endswith('}'):
+        return False
+    text = _THINK_RE.sub('', text)
+    if '<think>' in text:
+        return False
+    return _find_tool_request(text) is not None
+
+
+def _iter_json_values(text: str, start_re: re.Pattern):
+    """Yield the JSON values embedded in ``text`` that begin where ``start_re`` matches.
+
+    Each candidate is decoded in place by json's C scanner (raw_decode), so
+    surrounding prose and braces inside strings need no hand-written walker.
+    Scanning resumes after a decoded value, so its contents aren't revisited.
+    """
+    pos = 0
+    while (match := start_re.search(text, pos)) is not None:
+        try:
+            value, pos = _JSON_DECODER.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            pos = match.start() + 1
+            continue
+        yield value
+
+
+# Tool name -> (module in leap_agent.tools, function); the modules are only
+# imported once one of their tools is called
+_TOOL_REGISTRY = {
+    "read_file": ("file_tools", "read_file"),
+    "read_files": ("file_tools", "read_files"),
+    "write_file": ("file_tools", "write_file"),
+    "replace_in_file": ("file_tools", "replace_in_file"),
+    "insert_in_file": ("file_tools", "insert_in_file"),
+    "list_directory": ("file_tools", "list_directory"),
+    "search_files": ("file_tools", "search_files"),
+    "file_info": ("file_tools", "file_info"),
+    "run_shell_command": ("shell_tools", "run_command"),
+    "get_shell_env": ("shell_tools", "get_environment"),
+    "web_search": ("web_tools", "web_search"),
+    "news_search": ("web_tools", "news_search"),
+    "fetch_url": ("web_tools", "fetch_url"),
+    "crawl_webpage": ("web_tools", "crawl_webpage"),
+    "analyze_code": ("code_tools", "analyze_code"),
+    "grep_code": ("code_tools", "grep_code"),
+    "find_definition": ("code_tools", "find_definition"),
+    "read_definition": ("code_tools", "read_definition"),
+    "replace_definition": ("code_tools", "replace_definition"),
+    "calculate": ("utility_tools", "calculate"),
+    "current_time": ("utility_tools", "get_datetime"),  # Updated to match catalogue
+    "get_current_time": ("utility_tools", "get_datetime"), # Keep for backward compatibility
+    "parse_json": ("utility_tools", "json_parse"),
+}
+
+
+class _LazyTools(Mapping):
+    """Tool name -> function, importing each tool module on first lookup."""
+    
+    def __init__(self, registry: dict):
+        self._registry = registry
+        self._loaded: dict = {}
+    
+    def __getitem__(self, name: str):
+        try:
+            return self._loaded[name]
+        except KeyError:
+            module_name, attr = self._registry[name]
+        module = importlib.import_module(f"{__package__}.tools.{module_name}")
+        func = self._loaded[name] = getattr(module, attr)
+        return func
+    
+    def __contains__(self, name) -> bool:
+        return name in self._registry
+    
+    def __iter__(self):
+        return iter(self._registry)
+    
+    def __len__(self) -> int:
+        return len(self._registry)
+
+
 @dataclass
 class OrchestrationMetrics:
     """Track orchestration performance."""
@@ -50,38 +324,13 @@ class LEAPOrchestrator:
         if self.config.warmup_models:
             self.inference.warmup()
     
-    def _load_tools(self) -> dict:
+    def _load_tools(self) -> "_LazyTools":
         """Load tool functions."""
-        from .tools import file_tools, shell_tools, web_tools, code_tools, utility_tools
-        
-        return {
-            "read_file": file_tools.read_file,
-            "write_file": file_tools.write_file,
-            "replace_in_file": file_tools.replace_in_file,
-            "insert_in_file": file_tools.insert_in_file,
-            "list_directory": file_tools.list_directory,
-            "search_files": file_tools.search_files,
-            "file_info": file_tools.file_info,
-            "run_shell_command": shell_tools.run_command,
-            "get_shell_env": shell_tools.get_environment,
-            "web_search": web_tools.web_search,
-            "news_search": web_tools.news_search,
-            "fetch_url": web_tools.fetch_url,
-            "crawl_webpage": web_tools.crawl_webpage,
-            "analyze_code": code_tools.analyze_code,
-            "grep_code": code_tools.grep_code,
-            "find_definition": code_tools.find_definition,
-            "read_definition": code_tools.read_definition,
-            "replace_definition": code_tools.replace_definition,
-            "calculate": utility_tools.calculate,
-            "current_time": utility_tools.get_datetime,  # Updated to match catalogue
-            "get_current_time": utility_tools.get_datetime, # Keep for backward compatibility
-            "parse_json": utility_tools.json_parse,
-        }
+        return _LazyTools(_TOOL_REGISTRY)
     
     def _print_thinking(self, response: str, label: str = "Thinking"):
         """Extract and print thinking blocks."""
-        thinking = re.findall(r'<think>(.*?)</think>', response, flags=re.DOTALL)
+        thinking = _THINK_BODY_RE.findall(response)
         if thinking and self.config.verbose:
             print(f"\n🧠 {label}:")
             for thought in thinking:
@@ -89,7 +338,7 @@ class LEAPOrchestrator:
     
     def run(self, query: str, max_turns: int = 15) -> str:
         """Process a user query through the LEAP pipeline (Rolling O(1) State)."""
-        self.state_summary = "No actions taken yet."
+        self.state_summary = _INITIAL_STATE
         total_start = time.time()
         
         if self.config.verbose:
@@ -121,6 +370,11 @@ class LEAPOrchestrator:
             if self.config.verbose:
                 print(f"✅ Phase 1: Tool request - {tool_request.get('tool', 'unknown')}")
             
+            # Load the subagent while the tool runs if it will likely filter
+            # the result; plain top-level fields are usually picked locally
+            if self.config.enable_filtering and any('.' in str(f) for f in tool_request.get('filter') or ()):
+                self.inference.prefetch(self.config.sub_model)
+            
             # Phase 2: Execution (Subagent)
             phase2_start = time.time()
             filtered_response = self._phase2_execution(tool_request)
@@ -149,12 +403,7 @@ class LEAPOrchestrator:
 
     def _generate_final_answer(self, query: str) -> str:
         """Generate final answer from rolling state summary."""
-        prompt = f"""User query: {query}
-        Summary of actions taken:
-        {self.state_summary}
-        
-        Based on this summary, provide the final answer to the user request.
-        If you created files or verified code, report what was done."""
+        prompt = _FINAL_ANSWER_TEMPLATE.format(query=query, state=self.state_summary)
 
         return self.inference.generate(
             model=self.config.main_model,
@@ -165,38 +414,23 @@ class LEAPOrchestrator:
     
     def _phase1_planning(self, query: str) -> Optional[dict]:
         """Phase 1: Main agent decides NEXT tool using Rolling State."""
-        catalogue = get_catalogue_prompt()
-        
-        prompt = f"""You are an autonomous AI agent whose main job is to assist users with their tasks. 
-                     You are supposed to help them with their tasks using the following tools given to you.
-        
-        Tools: {catalogue}
-        
-        User request: {query}
-        
-        Current Progress:
-        {self.state_summary}
-        
-        Which tool should be used NEXT? 
-        1. CRITICAL: You MUST think about the request first inside <think> tags.
-        2. Then reply with the JSON tool request.
-        
-        Which tool should be used NEXT? 
-        
-        Optional: You can explain your reasoning in <think> tags before the JSON.
-        Required: You MUST reply with the JSON tool request.
-        
-        Example:
-        <think>
-        I need to list files to see what's here.
-        </think>
-        {{"tool": "fs_list", "params": {{"path": "."}} }}
-        
-        Your answer:"""
-        
-        response = self.inference.generate(
+        # Obvious first steps skip the planning model; later turns still
+        # plan, so the agent can decide it is done
+        if self.state_summary == _INITIAL_STATE:
+            tool_request = _route_intent(query)
+            if tool_request is not None:
+                if self.config.verbose:
+                    print(f"Phase 1: Routed to {tool_request['tool']} without planning")
+                return tool_request
+        
+        prompt = _PLANNING_PROMPT.format(query=query, state=self.state_summary)
+        
+        # The request is a single JSON object, so stop generating once it is
+        # complete instead of running on to max_tokens
+        response = self.inference.generate_until(
             model=self.config.main_model,
             prompt=prompt,
+            stop=_planning_done,
             temperature=0.3,
             max_tokens=300,
         )
@@ -209,22 +443,17 @@ class LEAPOrchestrator:
 
     def _phase3_update_state(self, query: str, tool_request: dict, tool_result: str):
         """Phase 3: Update the rolling state summary."""
-        prompt = f"""Update the progress summary for this task.
-        
-        User Request: {query}
-        
-        Old Summary:
-        {self.state_summary}
-        
-        New Action: Used {tool_request.get("tool")}
-        Result: {tool_result[:1000]}
-        
-        Write a concise, updated summary of what has been done so far. 
-        Do not lose important details from the Old Summary.
-        Merge the New Action into the summary.
-        Keep it under 300 words.
-        
-        Updated Summary:"""
+        tool_name = tool_request.get("tool")
+        if tool_name in _TEMPLATED_STATE_TOOLS:
+            self._append_state(tool_name, tool_request.get("params", {}), tool_result)
+            return
+        
+        prompt = _UPDATE_STATE_TEMPLATE.format(
+            query=query,
+            state=self.state_summary,
+            tool=tool_name,
+            result=tool_result[:1000],
+        )
 
         response = self.inference.generate(
             model=self.config.main_model,
@@ -233,59 +462,42 @@ class LEAPOrchestrator:
             max_tokens=512
         )
         # Clean thinking tags
-        self.state_summary = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL).strip()
+        self.state_summary = _cap_summary(_THINK_RE.sub('', response).strip())
         
         if self.config.verbose:
             self._print_thinking(response, "Phase 3 Reasoning")
             print(f"   Phase 3: Updated State Summary")
             print(f"   Model response: {self.state_summary[:200]}...")
     
+    def _append_state(self, tool_name: str, params: dict, tool_result: str):
+        """Record a cheap tool's result in the summary without an LLM call."""
+        line = f"- Used {tool_name}({_json_dumps(params)}) -> {tool_result[:_TEMPLATED_RESULT_CHARS]}"
+        if self.state_summary == _INITIAL_STATE:
+            self.state_summary = line
+        else:
+            self.state_summary = _cap_summary(f"{self.state_summary}\n{line}")
+        
+        if self.config.verbose:
+            print(f"   Phase 3: Appended {tool_name} result to State Summary")
+    
     def _parse_tool_request(self, response: str) -> Optional[dict]:
         """Extract JSON tool request from model response."""
         # Remove thinking tags if present
-        response = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL)
-        response = re.sub(r'```json\s*', '', response)
-        response = re.sub(r'```\s*', '', response)
+        response = _THINK_RE.sub('', response)
+        response = _JSON_FENCE_RE.sub('', response)
+        response = _FENCE_RE.sub('', response)
         response = response.strip()
         
-        # Try direct JSON parse first (most reliable)
-        try:
-            parsed = json.loads(response)
-            if isinstance(parsed, dict) and 'tool' in parsed:
-                if parsed.get('tool') is None or parsed.get('tool') == 'null':
-                    return None
-                return parsed
-        except json.JSONDecodeError:
-            if self.config.verbose:
-                print(f"⚠️ JSON Parse Failed. content: {response[:100]}...")
-            pass
-        
-        # Find JSON with balanced braces
-        def extract_json_object(text: str) -> Optional[str]:
-            start = text.find('{')
-            if start == -1:
+        # Decode each candidate object with the C scanner; the first one
+        # naming a tool wins
+        parsed = _find_tool_request(response)
+        if parsed is not None:
+            if parsed.get('tool') is None or parsed.get('tool') == 'null':
                 return None
-            depth = 0
-            for i, c in enumerate(text[start:], start):
-                if c == '{':
-                    depth += 1
-                elif c == '}':
-                    depth -= 1
-                    if depth == 0:
-                        return text[start:i+1]
-            return None
-        
-        json_str = extract_json_object(response)
-        if json_str:
-            try:
-                parsed = json.loads(json_str)
-                if isinstance(parsed, dict) and 'tool' in parsed:
-                    if parsed.get('tool') is None or parsed.get('tool') == 'null':
-                        return None
-                    return parsed
-            except json.JSONDecodeError:
-                pass
+            return parsed
         
+        if self.config.verbose:
+            print(f"⚠️ JSON Parse Failed. content: {response[:100]}...")
         return None
     
     def _phase2_execution(self, tool_request: dict) -> str:
@@ -304,35 +516,55 @@ class LEAPOrchestrator:
         if self.config.verbose:
             print(f"Executing: {tool_name}")
             if params:
-                print(f"   Params: {json.dumps(params, indent=2)}")
+                print(f"   Params: {_json_dumps(params)}")
 
         # Execute tool
         if tool_name not in self.tools:
-            return json.dumps({"error": f"Unknown tool: {tool_name}"})
+            return _json_dumps({"error": f"Unknown tool: {tool_name}"})
         
         try:
             tool_func = self.tools[tool_name]
             raw_result = tool_func(**params) if params else tool_func()
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            return _json_dumps({"error": str(e)})
         
-        # Track raw response size
-        raw_json = json.dumps(raw_result) if isinstance(raw_result, dict) else str(raw_result)
+        # Size the full result for the metrics without serializing it, then
+        # bound it before anything serializes it; a fetched page or file can
+        # be megabytes
+        if isinstance(raw_result, str):
+            full_size = len(raw_result)
+        else:
+            full_size = _estimate_json_chars(raw_result)
+        raw_result = _cap_strings(raw_result, self.config.max_raw_response)
+        
+        # Track raw response size; a dict is only serialized once its text
+        # is needed, which a locally filtered result never is
+        if isinstance(raw_result, dict):
+            raw_json = None
+            raw_size = _estimate_json_chars(raw_result)
+        else:
+            raw_json = str(raw_result)
+            raw_size = len(raw_json)
         
         if self.config.verbose:
+            if raw_json is None:
+                raw_json = _json_dumps(raw_result)
             preview = raw_json[:200] + "..." if len(raw_json) > 200 else raw_json
             print(f"✅ Result: {preview}")
             
-        self.metrics.raw_response_tokens = len(raw_json) // 4
+        self.metrics.raw_response_tokens = full_size // 4
         
         # Filter response using subagent
         if self.config.enable_filtering and filter_fields:
-            filtered = self._filter_response(raw_result, filter_fields)
+            filtered = self._filter_response(raw_result, filter_fields, raw_json, raw_size)
         else:
             filtered = raw_result
         
         # Track filtered response size
-        filtered_json = json.dumps(filtered) if isinstance(filtered, dict) else str(filtered)
+        if filtered is raw_result:
+            filtered_json = raw_json if raw_json is not None else _json_dumps(raw_result)
+        else:
+            filtered_json = _json_dumps(filtered) if isinstance(filtered, dict) else str(filtered)
         self.metrics.filtered_response_tokens = len(filtered_json) // 4
         
         if self.metrics.raw_response_tokens > 0:
@@ -342,8 +574,19 @@ class LEAPOrchestrator:
         
         return filtered_json
     
-    def _filter_response(self, raw_result: any, filter_fields: list) -> dict:
-        """Use subagent to filter response to only needed fields."""
+    def _filter_response(
+        self,
+        raw_result: any,
+        filter_fields: list,
+        raw_json: Optional[str] = None,
+        raw_size: Optional[int] = None,
+    ) -> dict:
+        """Use subagent to filter response to only needed fields.
+        
+        ``raw_json`` is the compact JSON if phase 2 already dumped it, reused
+        rather than serializing the result again; ``raw_size`` is its length,
+        known even when it hasn't been dumped.
+        """
         if isinstance(raw_result, str):
             # If already string, try to extract key info
             return {"content": raw_result[:1000]}
@@ -352,12 +595,20 @@ class LEAPOrchestrator:
             return {"result": str(raw_result)[:1000]}
         
         # For dict responses, use subagent to filter intelligently
-        raw_json = json.dumps(raw_result, indent=2)
+        if raw_size is None:
+            raw_size = _estimate_json_chars(raw_result) if raw_json is None else len(raw_json)
         
         # If raw response is small, don't bother filtering
-        if len(raw_json) < 500:
+        if raw_size < 500:
             return raw_result
         
+        # Top-level fields that are all present need no subagent call
+        filtered = {f: raw_result[f] for f in filter_fields if f in raw_result}
+        if len(filtered) == len(filter_fields) and len(_json_dumps(filtered)) < _LOCAL_FILTER_CHARS:
+            return filtered
+        
+        if raw_json is None:
+            raw_json = _json_dumps(raw_result)
         prompt = f"""Extract only these fields from the data: {filter_fields}
 
 Data:
@@ -375,15 +626,10 @@ Return ONLY a compact JSON with the requested fields. No explanation."""
         if self.config.verbose:
             print(f" Sub-Agent Filter Response: {response}")
         
-        # Parse filtered result
-        try:
-            # Remove thinking tags
-            response = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL)
-            json_match = re.search(r'[\{\[].*[\}\]]', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-        except (json.JSONDecodeError, AttributeError):
-            pass
+        # Parse filtered result: the first JSON object or array after thinking
+        response = _THINK_RE.sub('', response)
+        for value in _iter_json_values(response, _VALUE_START_RE):
+            return value
         
         # Fallback: simple field extraction
         filtered = {}
@@ -409,7 +655,7 @@ Provide a clear, helpful answer based on this data."""
         )
         
         # Clean up response (remove thinking tags)
-        response = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL).strip()
+        response = _THINK_RE.sub('', response).strip()
         
         return response
     
@@ -432,7 +678,7 @@ Provide a clear, helpful answer based on this data."""
         )
         
         # Clean up response (remove thinking tags)
-        response = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL).strip()
+        response = _THINK_RE.sub('', response).strip()
         
         # Fallback if response is empty
         if not response or len(response) < 10:
@@ -444,7 +690,7 @@ Provide a clear, helpful answer based on this data."""
                 temperature=0.8,
                 max_tokens=2048
             )
-            response = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL).strip()
+            response = _THINK_RE.sub('', response).strip()
         
         return response
     
@@ -473,4 +719,4 @@ Provide a clear, helpful answer based on this data."""
     
     def get_available_tools(self) -> list[str]:
         """List available tool names."""
-        return list(self.tools.keys())
+        return list(_TOOL_REGISTRY)
@@ -1,5 +1,5 @@
 # LEAP Agent Tools
-from . import file_tools, shell_tools, web_tools, code_tools, utility_tools
+import importlib
 
 __all__ = [
     "file_tools",
@@ -8,3 +8,11 @@ __all__ = [
     "code_tools",
     "utility_tools",
 ]
+
+
+def __getattr__(name):
+    # Submodules are imported on first access, so loading one tool doesn't
+    # import them all
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
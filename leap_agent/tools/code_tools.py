@@ -2,39 +2,110 @@
 import ast
 import os
 import re
+import io
+import functools
+import textwrap
+import contextlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=32)
+def _read_cached(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _load_source(path: str) -> str:
+    """Read a text file, reusing the last read while its mtime and size are unchanged.
+
+    analyze_code, read_definition and replace_definition are often called
+    back to back on one file; together with _parse_source the repeat calls
+    neither read nor parse it again.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return _read_cached(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_source(content: str) -> ast.Module:
+    """Parse Python source, reusing the tree when the same content was parsed before.
+
+    Keyed by the text itself, so an edited file is reparsed while repeated
+    calls on an unchanged one are free. Callers must not modify the tree.
+    """
+    return ast.parse(content)
+
+
+# Nodes whose children can include statements; definitions and imports
+# never occur inside expressions, so other subtrees are skipped
+_BLOCK_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+_DEFINITION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _iter_statements(tree: ast.Module):
+    """Yield the statements of ``tree`` in the order ast.walk would reach them.
+
+    Walks breadth-first like ast.walk but only through statements, so the
+    expressions of the code are never visited.
+    """
+    todo = deque([tree])
+    while todo:
+        for child in ast.iter_child_nodes(todo.popleft()):
+            if isinstance(child, _BLOCK_NODES):
+                if isinstance(child, ast.stmt):
+                    yield child
+                todo.append(child)
+
+
+# Most entries of each kind analyze_code reports
+_MAX_CLASSES = 20
+_MAX_FUNCTIONS = 30
+_MAX_IMPORTS = 30
 
 
 def analyze_code(path: str) -> dict:
     """Analyze Python file structure."""
     try:
         path = os.path.expanduser(path)
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = _load_source(path)
         
-        tree = ast.parse(content)
+        tree = _parse_source(content)
         
         classes = []
         functions = []
         imports = []
         
-        for node in ast.walk(tree):
+        # Classes and functions are the module's top-level definitions;
+        # functions nested in classes are reported as methods instead
+        for node in ast.iter_child_nodes(tree):
             if isinstance(node, ast.ClassDef):
-                methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                classes.append({"name": node.name, "methods": methods, "line": node.lineno})
-            elif isinstance(node, ast.FunctionDef) and not isinstance(node, ast.AsyncFunctionDef):
-                if not any(node.lineno > c["line"] for c in classes if "methods" in c):
+                if len(classes) < _MAX_CLASSES:
+                    methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
+                    classes.append({"name": node.name, "methods": methods, "line": node.lineno})
+            elif isinstance(node, ast.FunctionDef):
+                if len(functions) < _MAX_FUNCTIONS:
                     functions.append({"name": node.name, "line": node.lineno})
-            elif isinstance(node, ast.Import):
+        
+        # Imports anywhere in the file, in ast.walk order, until enough are found
+        for node in _iter_statements(tree):
+            if isinstance(node, ast.Import):
                 imports.extend(alias.name for alias in node.names)
             elif isinstance(node, ast.ImportFrom):
                 if node.module:
                     imports.append(node.module)
+            else:
+                continue
+            if len(imports) >= _MAX_IMPORTS:
+                break
         
         return {
             "path": path,
-            "classes": classes[:20],
-            "functions": functions[:30],
-            "imports": imports[:30],
+            "classes": classes,
+            "functions": functions,
+            "imports": imports[:_MAX_IMPORTS],
             "lines": len(content.splitlines()),
         }
     except SyntaxError as e:
@@ -46,6 +117,167 @@ def analyze_code(path: str) -> dict:
         return {"error": str(e), "path": path}
 
 
+# Anchors and negative assertions can match at the end of a lone line (after
+# its newline) but not at the same spot inside the whole file; patterns
+# using them are searched line by line
+_LINE_ONLY_RE = re.compile(r'\\[AZB]|\(\?<?!|\$')
+
+
+def _matching_lines(text: str, line_re: re.Pattern, scan_re: re.Pattern):
+    """Yield ``(line_number, line)`` for each line of ``text`` that ``line_re`` matches.
+
+    ``scan_re`` is the same pattern compiled with MULTILINE: it searches the
+    whole text in one C pass and can only over-match (e.g. across a line
+    break), so each line it lands on is checked again with ``line_re``.
+    """
+    pos = line_start = 0
+    line_no = 1
+    size = len(text)
+    while (match := scan_re.search(text, pos)) is not None:
+        at = match.start()
+        start = text.rfind('\n', 0, at) + 1
+        if start == at and at > pos:
+            # A match at a line start may be a lone-line match at the very
+            # end of the previous line, after its newline; check that first
+            start = text.rfind('\n', 0, at - 1) + 1
+        if start >= size:
+            break
+        line_no += text.count('\n', line_start, start)
+        line_start = start
+        end = text.find('\n', start)
+        end = size if end < 0 else end + 1
+        line = text[start:end]
+        if line_re.search(line):
+            yield line_no, line
+        if end >= size:
+            break
+        pos = end
+
+
+# Larger files are generated or vendored, not worth scanning
+_MAX_SCAN_BYTES = 2 << 20
+# A NUL byte this early marks a binary file
+_BINARY_SNIFF_BYTES = 8192
+
+
+def _read_source(fpath: str, errors: str = 'strict') -> Optional[str]:
+    """Text of a source file as text mode would read it, or None if it is
+    oversized or binary.
+
+    The size is checked before reading anything, and the file is read once
+    for both the binary sniff and the text. Raises UnicodeDecodeError, in
+    strict mode, for a file that isn't UTF-8.
+    """
+    with open(fpath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > _MAX_SCAN_BYTES:
+            return None
+        data = f.read()
+    if b'\x00' in data[:_BINARY_SNIFF_BYTES]:
+        return None
+    text = data.decode('utf-8', errors)
+    if '\r' in text:
+        # Universal newlines, as in text mode
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _iter_until_error(f):
+    """Number the lines of text file ``f``, stopping quietly where decoding fails."""
+    try:
+        yield from enumerate(f, 1)
+    except UnicodeDecodeError:
+        return
+
+
+# Directory names never searched: VCS data, caches and installed packages
+_SKIP_DIRS = frozenset({'.git', '__pycache__', 'node_modules'})
+# Usual virtualenv names; skipped only when they hold a pyvenv.cfg, since
+# e.g. the stdlib has a venv package
+_VENV_NAMES = frozenset({'.venv', 'venv', 'env', '.env'})
+
+
+def _skip_dir(entry: os.DirEntry) -> bool:
+    if entry.name in _SKIP_DIRS:
+        return True
+    return entry.name in _VENV_NAMES and os.path.exists(os.path.join(entry.path, 'pyvenv.cfg'))
+
+
+def _walk_code_files(directory: str, extensions: list):
+    """Yield paths of files under ``directory`` with one of ``extensions``.
+
+    Walks with os.scandir in os.walk's top-down order (a directory's files,
+    then its subdirectories), reusing each DirEntry's cached type instead
+    of stat-ing paths. Skipped directories are pruned before being listed.
+    """
+    suffixes = tuple(extensions)
+    stack = [directory]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        # Like os.walk, don't follow symlinked directories
+                        if not entry.is_symlink() and not _skip_dir(entry):
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(suffixes):
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+# Reads release the GIL, so a few threads per core keep the disk busy
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Files submitted ahead of the one being consumed
+_SCAN_WINDOW = _SCAN_WORKERS * 2
+
+
+def _map_files(scan, paths):
+    """Yield ``scan(path)`` for each path, in order, scanning files on a thread pool.
+
+    Only a bounded window of files is in flight, so a caller that stops
+    early (closing this generator) doesn't wait for the whole tree.
+    """
+    with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as pool:
+        window = deque()
+        try:
+            for path in paths:
+                window.append(pool.submit(scan, path))
+                if len(window) >= _SCAN_WINDOW:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+        finally:
+            for future in window:
+                future.cancel()
+
+
+def _find_in_file(fpath: str, line_re: re.Pattern, scan_re: re.Pattern) -> list:
+    """Definition hits in one file; a file that fails to decode keeps the hits before the error."""
+    results = []
+    try:
+        try:
+            text = _read_source(fpath)
+            lines = _matching_lines(text, line_re, scan_re) if text is not None else ()
+        except UnicodeDecodeError:
+            with open(fpath, 'r', encoding='utf-8') as f:
+                lines = [(i, line) for i, line in _iter_until_error(f) if line_re.match(line)]
+        for i, line in lines:
+            results.append({
+                "file": fpath,
+                "line": i,
+                "content": line.strip()
+            })
+    except Exception:
+        pass
+    return results
+
+
 def find_definition(symbol: str, directory: str = ".") -> dict:
     """Find where a symbol is defined.
     
@@ -63,30 +295,17 @@ def find_definition(symbol: str, directory: str = ".") -> dict:
             rf'^\s+{re.escape(symbol)}\s*=',
         ]
         
+        # One alternation, compiled once, so each file is a single regex pass
+        combined = '|'.join(f'(?:{p})' for p in patterns)
+        line_re = re.compile(combined)
+        scan_re = re.compile(combined, re.MULTILINE)
+        
         extensions = ['.py', '.js', '.ts', '.jsx', '.tsx']
         
-        for root, _, files in os.walk(directory):
-            if '.git' in root or '__pycache__' in root or 'node_modules' in root:
-                continue
-                
-            for fname in files:
-                if not any(fname.endswith(ext) for ext in extensions):
-                    continue
-                    
-                fpath = os.path.join(root, fname)
-                try:
-                    with open(fpath, 'r', encoding='utf-8') as f:
-                        for i, line in enumerate(f, 1):
-                            for pattern in patterns:
-                                if re.match(pattern, line):
-                                    results.append({
-                                        "file": fpath,
-                                        "line": i,
-                                        "content": line.strip()
-                                    })
-                                    break
-                except:
-                    continue
+        paths = _walk_code_files(directory, extensions)
+        scan = functools.partial(_find_in_file, line_re=line_re, scan_re=scan_re)
+        for hits in _map_files(scan, paths):
+            results.extend(hits)
         
         return {
             "symbol": symbol,
@@ -98,6 +317,36 @@ def find_definition(symbol: str, directory: str = ".") -> dict:
         return {"error": str(e), "symbol": symbol}
 
 
+# Most matches grep_code returns
+_GREP_LIMIT = 50
+
+
+def _grep_file(fpath: str, line_re: re.Pattern, scan_re: Optional[re.Pattern]) -> list:
+    """Up to ``_GREP_LIMIT`` matching lines of one file."""
+    matches = []
+    try:
+        text = _read_source(fpath, errors='ignore')
+        if text is None:
+            return matches
+        if scan_re is None:
+            lines = (
+                (i, line) for i, line in enumerate(io.StringIO(text), 1) if line_re.search(line)
+            )
+        else:
+            lines = _matching_lines(text, line_re, scan_re)
+        for i, line in lines:
+            matches.append({
+                "file": fpath,
+                "line": i,
+                "content": line.strip()[:100],
+            })
+            if len(matches) >= _GREP_LIMIT:
+                break
+    except Exception:
+        pass
+    return matches
+
+
 def grep_code(pattern: str, directory: str = ".") -> dict:
     """Search for pattern in code files."""
     try:
@@ -106,33 +355,15 @@ def grep_code(pattern: str, directory: str = ".") -> dict:
         
         extensions = ['.py', '.js', '.ts', '.java', '.go', '.rs', '.c', '.cpp', '.h']
         
-        for root, _, files in os.walk(directory):
-            if '.git' in root or '__pycache__' in root or 'node_modules' in root:
-                continue
-                
-            for fname in files:
-                if not any(fname.endswith(ext) for ext in extensions):
-                    continue
-                    
-                fpath = os.path.join(root, fname)
-                try:
-                    with open(fpath, 'r', encoding='utf-8', errors='ignore') as f:
-                        for i, line in enumerate(f, 1):
-                            if re.search(pattern, line):
-                                matches.append({
-                                    "file": fpath,
-                                    "line": i,
-                                    "content": line.strip()[:100],
-                                })
-                                if len(matches) >= 50:
-                                    break
-                except:
-                    continue
-                    
-                if len(matches) >= 50:
+        line_re = re.compile(pattern)
+        scan_re = None if _LINE_ONLY_RE.search(pattern) else re.compile(pattern, re.MULTILINE)
+        
+        scan = functools.partial(_grep_file, line_re=line_re, scan_re=scan_re)
+        with contextlib.closing(_map_files(scan, _walk_code_files(directory, extensions))) as scans:
+            for hits in scans:
+                matches.extend(hits[:_GREP_LIMIT - len(matches)])
+                if len(matches) >= _GREP_LIMIT:
                     break
-            if len(matches) >= 50:
-                break
         
         return {
             "pattern": pattern,
@@ -144,20 +375,21 @@ def grep_code(pattern: str, directory: str = ".") -> dict:
         return {"error": str(e), "pattern": pattern}
 
 
+def _find_definition_node(tree: ast.Module, name: str):
+    """The shallowest function or class named ``name``, as ast.walk would find it first."""
+    for node in _iter_statements(tree):
+        if isinstance(node, _DEFINITION_NODES) and node.name == name:
+            return node
+    return None
+
+
 def read_definition(path: str, name: str) -> dict:
     """Read source code of a function or class."""
     try:
         path = os.path.expanduser(path)
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        tree = ast.parse(content)
-        target = None
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                if node.name == name:
-                    target = node
-                    break
+        content = _load_source(path)
+        tree = _parse_source(content)
+        target = _find_definition_node(tree, name)
         
         if not target:
             return {"error": f"Definition '{name}' not found", "path": path}
@@ -181,16 +413,9 @@ def replace_definition(path: str, name: str, new_content: str) -> dict:
     """Replace definition of a function or class."""
     try:
         path = os.path.expanduser(path)
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        tree = ast.parse(content)
-        target = None
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                if node.name == name:
-                    target = node
-                    break
+        content = _load_source(path)
+        tree = _parse_source(content)
+        target = _find_definition_node(tree, name)
         
         if not target:
             return {"error": f"Definition '{name}' not found", "path": path}
@@ -199,25 +424,26 @@ def replace_definition(path: str, name: str, new_content: str) -> dict:
         start = target.lineno - 1
         end = target.end_lineno
         
-        # Indentation handling
+        # Indent unindented replacements of nested definitions to match;
+        # textwrap.indent leaves whitespace-only lines alone
         original_indent = len(lines[start]) - len(lines[start].lstrip())
         new_lines = new_content.splitlines()
-        if new_lines and (len(new_lines[0]) - len(new_lines[0].lstrip()) == 0) and original_indent > 0:
-             indent_str = " " * original_indent
-             new_lines = [indent_str + line if line.strip() else line for line in new_lines]
-             new_content = "\n".join(new_lines)
+        if original_indent > 0 and new_lines and not new_lines[0][:1].isspace():
+            new_content = textwrap.indent(new_content, " " * original_indent)
              
         new_file_lines = lines[:start] + new_content.splitlines() + lines[end:]
         new_file_content = "\n".join(new_file_lines)
         
         # Verify syntax
         try:
-            ast.parse(new_file_content)
+            _parse_source(new_file_content)
         except SyntaxError as e:
            return {"error": f"Syntax error in new content: {e}", "path": path}
            
         with open(path, 'w', encoding='utf-8') as f:
             f.write(new_file_content)
+        # A rewrite within the filesystem's mtime granularity could keep the key
+        _read_cached.cache_clear()
             
         return {
             "success": True,
@@ -5,19 +5,23 @@ The subagent executes them directly.
 """
 import os
 import glob
+from itertools import islice
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 
 def read_file(path: str) -> dict:
     """Read file contents."""
     try:
         path = os.path.expanduser(path)
+        # Only the shown head is read and decoded; size comes from the inode
         with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+            size = os.fstat(f.fileno()).st_size
+            content = f.read(10001)
         
         return {
             "content": content[:10000],  # Limit raw content
-            "size": len(content),
+            "size": size,
             "path": path,
             "truncated": len(content) > 10000,
         }
@@ -25,6 +29,49 @@ def read_file(path: str) -> dict:
         return {"error": str(e), "path": path}
 
 
+# Most files read_files reads in one call
+READ_FILES_LIMIT = 20
+
+
+def _read_head(path: str, max_bytes: int) -> dict:
+    """Read up to ``max_bytes`` of one file for read_files."""
+    try:
+        path = os.path.expanduser(path)
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            data = f.read(max_bytes + 1)
+        
+        return {
+            "path": path,
+            "content": data[:max_bytes].decode('utf-8', errors='ignore'),
+            "size": size,
+            "truncated": len(data) > max_bytes,
+        }
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+
+def read_files(paths: list, max_bytes: int = 10000) -> dict:
+    """Read several files in one call, each up to max_bytes."""
+    try:
+        if isinstance(paths, str):
+            paths = [paths]
+        paths = list(paths)[:READ_FILES_LIMIT]
+        if not paths:
+            return {"error": "No paths given"}
+        
+        # Reads release the GIL, so the files load concurrently
+        with ThreadPoolExecutor(max_workers=min(len(paths), 8)) as pool:
+            files = list(pool.map(lambda p: _read_head(p, max_bytes), paths))
+        
+        return {
+            "files": files,
+            "count": len(files),
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+
 def write_file(path: str, content: str) -> dict:
     """Write content to file."""
     try:
@@ -76,7 +123,8 @@ def search_files(pattern: str, directory: str = ".") -> dict:
     try:
         directory = os.path.expanduser(directory)
         search_pattern = os.path.join(directory, "**", pattern)
-        matches = glob.glob(search_pattern, recursive=True)[:50]
+        # iglob walks lazily, so the walk stops at the 50th match
+        matches = list(islice(glob.iglob(search_pattern, recursive=True), 50))
         
         return {
             "pattern": pattern,
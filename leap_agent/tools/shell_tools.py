@@ -1,14 +1,24 @@
 """Shell tools for LEAP Agent."""
 import subprocess
 import os
+import re
 import platform
 
 
+# Commands refused outright; any run of whitespace between tokens still
+# matches, so e.g. "rm  -rf /" isn't a way around the check
+_DANGEROUS_RE = re.compile(
+    r'rm\s+-(?:rf|fr)\s+/'
+    r'|mkfs'
+    r'|dd\s+if='
+    r'|:\s*\(\s*\)\s*\{\s*:\s*\|\s*:\s*&\s*\}\s*;\s*:'  # fork bomb
+)
+
+
 def run_command(command: str, timeout: int = 30) -> dict:
     """Execute shell command."""
     # Safety check
-    dangerous = ["rm -rf /", "mkfs", "dd if=", ":(){:|:&};:"]
-    if any(d in command for d in dangerous):
+    if _DANGEROUS_RE.search(command):
         return {"error": "Command blocked for safety", "command": command}
     
     try:
@@ -1,23 +1,194 @@
 """Utility tools for LEAP Agent."""
+import ast
 import json
 import math
+import operator
+import functools
+import itertools
 from datetime import datetime
 
 
+# Names and operators allowed in calculate(); anything else is rejected
+_CALC_NAMES = {
+    "abs": abs, "round": round, "min": min, "max": max,
+    "pow": pow, "len": len,
+    "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos,
+    "tan": math.tan, "log": math.log, "log10": math.log10,
+    "exp": math.exp, "pi": math.pi, "e": math.e,
+    "floor": math.floor, "ceil": math.ceil,
+}
+_CALC_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_CALC_UNARYOPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+# Bounds on what one operation may build; bigger integers take minutes to
+# compute and huge sequences exhaust memory, so they are refused up front.
+# The bit bound stays well under the 4300 digits int -> str conversion
+# allows by default, so every result can be printed and serialized
+_CALC_MAX_BITS = 1 << 13
+_CALC_MAX_ITEMS = 1 << 20
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_expression(expression: str) -> ast.expr:
+    return ast.parse(expression.strip(), mode='eval').body
+
+
+def _eval_node(node):
+    handler = _CALC_NODES.get(type(node))
+    if handler is None:
+        raise ValueError(f"unsupported syntax '{type(node).__name__}'")
+    return handler(node)
+
+
+def _eval_constant(node: ast.Constant):
+    if type(node.value) not in (int, float, complex):
+        raise ValueError(f"unsupported constant {node.value!r}")
+    return node.value
+
+
+def _eval_name(node: ast.Name):
+    try:
+        return _CALC_NAMES[node.id]
+    except KeyError:
+        raise ValueError(f"name '{node.id}' is not defined") from None
+
+
+def _check_pow(base, exponent):
+    """Refuse an integer power whose result would exceed ``_CALC_MAX_BITS``."""
+    if type(base) is int and type(exponent) is int and exponent > 0 and abs(base) > 1:
+        if abs(base).bit_length() * exponent > _CALC_MAX_BITS:
+            raise ValueError(f"result of {_describe(base)} ** {exponent} would be too large")
+
+
+def _count_items(value, seen: dict) -> int:
+    """Items in ``value`` including those of nested sequences, a shared one counted at every use."""
+    if not isinstance(value, (list, tuple)):
+        return 0
+    key = id(value)
+    if key not in seen:
+        seen[key] = len(value) + sum(_count_items(item, seen) for item in value)
+    return seen[key]
+
+
+def _check_items(*parts, count: int = 1):
+    """Refuse a sequence built from ``parts`` (``count`` times over) that would exceed ``_CALC_MAX_ITEMS``."""
+    seen = {}
+    if sum(_count_items(part, seen) for part in parts) * count > _CALC_MAX_ITEMS:
+        raise ValueError("resulting sequence would be too large")
+
+
+def _check_mul(left, right):
+    """Refuse a product or sequence repetition that would exceed the size bounds."""
+    if type(left) is int and type(right) is int:
+        if left.bit_length() + right.bit_length() > _CALC_MAX_BITS:
+            raise ValueError("result of the multiplication would be too large")
+    elif isinstance(left, (list, tuple)) and type(right) is int or isinstance(right, (list, tuple)) and type(left) is int:
+        seq, count = (left, right) if isinstance(left, (list, tuple)) else (right, left)
+        _check_items(seq, count=count)
+
+
+def _check_add(left, right):
+    """Refuse a sequence concatenation that would exceed ``_CALC_MAX_ITEMS``."""
+    if isinstance(left, (list, tuple)) and isinstance(right, (list, tuple)):
+        _check_items(left, right)
+
+
+def _sum(iterable, start=0):
+    """sum() that joins sequences in linear time and within ``_CALC_MAX_ITEMS``.
+
+    The builtin copies the running total on every step, so summing lists is
+    quadratic and its result is never size-checked.
+    """
+    if not isinstance(start, (list, tuple)):
+        return sum(iterable, start)
+    parts = list(iterable)
+    for part in parts:
+        if type(part) is not type(start):
+            raise TypeError(f"can only concatenate {type(start).__name__} (not \"{type(part).__name__}\") to {type(start).__name__}")
+    _check_items(start, *parts)
+    return type(start)(itertools.chain(start, *parts))
+
+
+def _describe(value) -> str:
+    # Large bases are summarized; they can't be converted to text anyway
+    return str(value) if abs(value).bit_length() <= 64 else f"a {abs(value).bit_length()}-bit number"
+
+
+def _eval_binop(node: ast.BinOp):
+    op = _CALC_BINOPS.get(type(node.op))
+    if op is None:
+        raise ValueError(f"unsupported operator '{type(node.op).__name__}'")
+    left, right = _eval_node(node.left), _eval_node(node.right)
+    if op is operator.pow:
+        _check_pow(left, right)
+    elif op is operator.mul:
+        _check_mul(left, right)
+    elif op is operator.add:
+        _check_add(left, right)
+    return op(left, right)
+
+
+def _eval_unaryop(node: ast.UnaryOp):
+    op = _CALC_UNARYOPS.get(type(node.op))
+    if op is None:
+        raise ValueError(f"unsupported operator '{type(node.op).__name__}'")
+    return op(_eval_node(node.operand))
+
+
+def _eval_call(node: ast.Call):
+    if not isinstance(node.func, ast.Name) or node.keywords:
+        raise ValueError("only calls like sqrt(x) are allowed")
+    func = _eval_name(node.func)
+    if not callable(func):
+        raise ValueError(f"'{node.func.id}' is not a function")
+    args = [_eval_node(arg) for arg in node.args]
+    if func is pow and len(args) == 2:
+        # Three-argument pow is modular, so its result stays small
+        _check_pow(*args)
+    return func(*args)
+
+
+def _eval_list(node: ast.List):
+    items = [_eval_node(elt) for elt in node.elts]
+    _check_items(items)
+    return items
+
+
+def _eval_tuple(node: ast.Tuple):
+    items = tuple(_eval_node(elt) for elt in node.elts)
+    _check_items(items)
+    return items
+
+
+_CALC_NODES = {
+    ast.Constant: _eval_constant,
+    ast.Name: _eval_name,
+    ast.BinOp: _eval_binop,
+    ast.UnaryOp: _eval_unaryop,
+    ast.Call: _eval_call,
+    ast.List: _eval_list,
+    ast.Tuple: _eval_tuple,
+}
+# Registered here, once defined; the builtin sum() can't be bounded
+_CALC_NAMES["sum"] = _sum
+
+
 def calculate(expression: str) -> dict:
     """Evaluate mathematical expression safely."""
     try:
-        # Safe math context
-        safe_dict = {
-            "abs": abs, "round": round, "min": min, "max": max,
-            "sum": sum, "pow": pow, "len": len,
-            "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos,
-            "tan": math.tan, "log": math.log, "log10": math.log10,
-            "exp": math.exp, "pi": math.pi, "e": math.e,
-            "floor": math.floor, "ceil": math.ceil,
-        }
-        
-        result = eval(expression, {"__builtins__": {}}, safe_dict)
+        # Only whitelisted syntax is evaluated, so attribute access like
+        # ().__class__ can't escape the math context
+        result = _eval_node(_parse_expression(expression))
         
         return {
             "expression": expression,
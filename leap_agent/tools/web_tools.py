@@ -1,12 +1,61 @@
 """Web tools for LEAP Agent - using DDGS (free, no API)."""
+import re
+import atexit
+import functools
+import threading
+import contextlib
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    lxml_html = None
+except ImportError:
+    # lxml ships with duckduckgo-search; regexes are the last resort
+    HTMLParser = None
+    try:
+        import lxml.html as lxml_html
+        from lxml.etree import Comment as _lxml_comment
+    except ImportError:
+        lxml_html = None
+
+
+# DDGS class, imported on first search since duckduckgo_search is slow to import
+_DDGS = None
+# Idle DDGS clients, each keeping its HTTP session and connections alive
+_DDGS_IDLE: list = []
+
+
+def _ddgs_class():
+    """Return the DDGS class, importing duckduckgo_search once."""
+    global _DDGS
+    if _DDGS is None:
+        from duckduckgo_search import DDGS
+        _DDGS = DDGS
+    return _DDGS
+
+
+@contextlib.contextmanager
+def _ddgs_client():
+    """Check out a DDGS client, reusing an idle one so its session is kept.
+
+    Clients are checked out exclusively, so concurrent searches never share
+    one. A client whose search raised is dropped and replaced by a fresh
+    one next time.
+    """
+    try:
+        ddgs = _DDGS_IDLE.pop()
+    except IndexError:
+        ddgs = _ddgs_class()()
+    # DDGS paces requests on one client; each call used to get a fresh
+    # client, so don't carry that delay over from the previous call
+    ddgs.sleep_timestamp = 0.0
+    yield ddgs
+    _DDGS_IDLE.append(ddgs)
 
 
 def web_search(query: str, num_results: int = 5) -> dict:
     """Search the web using DuckDuckGo."""
     try:
-        from duckduckgo_search import DDGS
-        
-        with DDGS() as ddgs:
+        with _ddgs_client() as ddgs:
             results = list(ddgs.text(query, max_results=num_results))
         
         return {
@@ -28,9 +77,7 @@ def web_search(query: str, num_results: int = 5) -> dict:
 def news_search(query: str, num_results: int = 5) -> dict:
     """Search for recent news."""
     try:
-        from duckduckgo_search import DDGS
-        
-        with DDGS() as ddgs:
+        with _ddgs_client() as ddgs:
             results = list(ddgs.news(query, max_results=num_results))
         
         return {
@@ -50,24 +97,60 @@ def news_search(query: str, num_results: int = 5) -> dict:
         return {"error": str(e), "query": query}
 
 
+# Fallback HTML stripping when no parser is installed; scripts and styles
+# are dropped whole, other tags become a space
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _html_to_text(html: str) -> str:
+    """Return the text of an HTML page without scripts, styles or tags, whitespace collapsed.
+
+    Uses a C HTML parser (selectolax, else lxml) when available, which also
+    handles comments, CDATA and '>' inside attribute values correctly.
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        tree.strip_tags(['script', 'style', 'noscript'])
+        text = tree.text(separator=' ')
+    elif lxml_html is not None:
+        try:
+            doc = lxml_html.document_fromstring(html)
+        except Exception:
+            # Empty or unparseable documents have no text
+            return ''
+        for element in list(doc.iter('script', 'style', 'noscript', _lxml_comment)):
+            element.drop_tree()
+        text = ' '.join(doc.itertext())
+    else:
+        text = _TAG_RE.sub(' ', _SCRIPT_STYLE_RE.sub('', html))
+    
+    return ' '.join(text.split())
+
+
+@functools.lru_cache(maxsize=None)
+def _http_client():
+    """One keep-alive HTTP client shared by every fetch, created on first use.
+
+    Its connection pool lets repeat fetches from the same host skip the
+    TCP and TLS handshakes.
+    """
+    import httpx
+    return httpx.Client(
+        headers={'User-Agent': 'Mozilla/5.0'},
+        timeout=10,
+        follow_redirects=True,
+    )
+
+
 def fetch_url(url: str, max_length: int = 5000) -> dict:
     """Fetch webpage content."""
-    import urllib.request
-    import urllib.error
-    import re
-    
     try:
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        req = urllib.request.Request(url, headers=headers)
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            content = response.read().decode('utf-8', errors='ignore')
+        response = _http_client().get(url)
+        response.raise_for_status()
+        content = response.content.decode('utf-8', errors='ignore')
         
-        # Clean HTML
-        content = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL | re.I)
-        content = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL | re.I)
-        content = re.sub(r'<[^>]+>', ' ', content)
-        content = re.sub(r'\s+', ' ', content).strip()
+        content = _html_to_text(content)
         
         return {
             "url": url,
@@ -79,28 +162,63 @@ def fetch_url(url: str, max_length: int = 5000) -> dict:
         return {"error": str(e), "url": url}
 
 
+# Longest a single crawl may take once the browser is up
+_CRAWL_TIMEOUT = 30
+
+# One event loop thread and one started crawler, shared by every crawl so
+# the browser is launched once per process
+_crawl_lock = threading.Lock()
+_crawl_loop = None
+_crawler = None
+
+
+def _shared_crawler():
+    """Return the crawl event loop and the started crawler, creating them on first use.
+
+    Raises ImportError when crawl4ai isn't installed.
+    """
+    import asyncio
+    global _crawl_loop, _crawler
+    with _crawl_lock:
+        if _crawler is None:
+            from crawl4ai import AsyncWebCrawler
+            if _crawl_loop is None:
+                _crawl_loop = asyncio.new_event_loop()
+                threading.Thread(target=_crawl_loop.run_forever, name="crawl4ai", daemon=True).start()
+                atexit.register(_close_crawler)
+            crawler = AsyncWebCrawler()
+            asyncio.run_coroutine_threadsafe(crawler.__aenter__(), _crawl_loop).result()
+            _crawler = crawler
+        return _crawl_loop, _crawler
+
+
+def _close_crawler():
+    """Shut the shared crawler's browser down; the next crawl starts a new one."""
+    import asyncio
+    global _crawler
+    with _crawl_lock:
+        crawler, _crawler = _crawler, None
+    if crawler is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(
+                crawler.__aexit__(None, None, None), _crawl_loop
+            ).result(timeout=10)
+        except Exception:
+            pass
+
+
 def crawl_webpage(url: str) -> dict:
     """Crawl webpage using crawl4ai for better extraction."""
+    import asyncio
+    
     try:
-        import asyncio
-        from crawl4ai import AsyncWebCrawler
-        
-        async def _crawl():
-            async with AsyncWebCrawler() as crawler:
-                result = await crawler.arun(url=url)
-                return result
-        
-        # Run async
+        loop, crawler = _shared_crawler()
+        future = asyncio.run_coroutine_threadsafe(crawler.arun(url=url), loop)
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    result = pool.submit(asyncio.run, _crawl()).result()
-            else:
-                result = loop.run_until_complete(_crawl())
-        except RuntimeError:
-            result = asyncio.run(_crawl())
+            result = future.result(timeout=_CRAWL_TIMEOUT)
+        except TimeoutError:
+            future.cancel()
+            return {"error": f"Crawl timed out after {_CRAWL_TIMEOUT}s", "url": url}
         
         if not result.success:
             return {"error": result.error_message, "url": url}
@@ -115,4 +233,7 @@ def crawl_webpage(url: str) -> dict:
         # Fallback to basic fetch
         return fetch_url(url)
     except Exception as e:
+        # Page failures come back as result.success; an exception means the
+        # browser itself is in trouble, so start a fresh one next time
+        _close_crawler()
         return {"error": str(e), "url": url}
@@ -0,0 +1,56 @@
+"""Tests for the history window kept by langchain_agent.agent.ReactAgent."""
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from langchain_agent.agent import ReactAgent
+from langchain_agent.config import AgentConfig
+
+
+class _FakeGraph:
+    """Stands in for the compiled ReAct graph, recording what it was sent."""
+
+    def __init__(self):
+        self.sent = []
+
+    def invoke(self, state):
+        self.sent.append(state["messages"])
+        return {"messages": state["messages"] + [AIMessage(content="answer")]}
+
+    def stream(self, state):
+        self.sent.append(state["messages"])
+        yield {"agent": {"messages": [AIMessage(content="answer")]}}
+
+
+def _agent_with_full_history():
+    agent = ReactAgent(AgentConfig(max_history=3))
+    agent.agent = _FakeGraph()
+    # A full window whose oldest entry is the tool call the result answers
+    agent.history.extend([
+        AIMessage(content="", tool_calls=[{"name": "calculate", "args": {}, "id": "call-1"}]),
+        ToolMessage(content="4", tool_call_id="call-1"),
+        AIMessage(content="It is 4."),
+    ])
+    return agent
+
+
+def test_run_never_sends_orphaned_tool_result():
+    agent = _agent_with_full_history()
+
+    agent.run("and 3 + 3?")
+
+    sent = agent.agent.sent[0]
+    assert not isinstance(sent[0], ToolMessage)
+    assert isinstance(sent[-1], HumanMessage) and sent[-1].content == "and 3 + 3?"
+
+
+def test_run_streaming_never_sends_orphaned_tool_result():
+    agent = _agent_with_full_history()
+
+    assert "".join(agent.run_streaming("and 3 + 3?")) == "answer"
+
+    sent = agent.agent.sent[0]
+    assert not isinstance(sent[0], ToolMessage)
+    assert isinstance(sent[-1], HumanMessage)
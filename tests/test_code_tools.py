@@ -0,0 +1,97 @@
+"""Tests for langchain_agent.tools.code_tools."""
+import os
+
+from langchain_agent.tools import code_tools
+from langchain_agent.tools.code_tools import analyze_code, read_definition
+
+
+def test_parse_cache_follows_file_changes(tmp_path):
+    target = tmp_path / "mod.py"
+    target.write_text("def old():\n    pass\n")
+    assert "old" in analyze_code.invoke({"path": str(target)})
+
+    target.write_text("def new_name():\n    return 1\n")
+    # Same mtime is possible on coarse clocks; the size differs anyway
+    assert "new_name" in analyze_code.invoke({"path": str(target)})
+    assert "return 1" in read_definition.invoke({"path": str(target), "name": "new_name"})
+
+
+def test_parse_cache_is_bounded_and_in_memory(tmp_path):
+    code_tools._AST_CACHE.clear()
+    for i in range(code_tools._AST_CACHE_SIZE + 5):
+        path = tmp_path / f"m{i}.py"
+        path.write_text(f"x = {i}\n")
+        analyze_code.invoke({"path": str(path)})
+
+    assert len(code_tools._AST_CACHE) == code_tools._AST_CACHE_SIZE
+    # Nothing but the sources is written
+    assert sorted(os.listdir(tmp_path)) == sorted(f"m{i}.py" for i in range(code_tools._AST_CACHE_SIZE + 5))
+
+
+def _make_tree(root, count):
+    for i in range(count):
+        (root / f"f{i:03}.py").write_text(f"value_{i} = {i}\nneedle = {i}\n")
+
+
+def _expected(root, count):
+    return [(str(root / f"f{i:03}.py"), 2, f"needle = {i}") for i in range(count)]
+
+
+def _scan(root):
+    # Files come back in os.walk order, which follows the directory listing
+    return sorted(code_tools._scan_files(str(root), frozenset({".py"}), "needle"))
+
+
+def _small_thresholds(monkeypatch):
+    monkeypatch.setattr(code_tools, "PARALLEL_MIN_FILES", 4)
+    monkeypatch.setattr(code_tools, "PARALLEL_START_FILES", 4)
+    monkeypatch.setattr(code_tools, "SCAN_BATCH", 3)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+
+
+def test_parallel_scan_matches_serial(tmp_path, monkeypatch):
+    _small_thresholds(monkeypatch)
+    _make_tree(tmp_path, 20)
+
+    assert _scan(tmp_path) == _expected(tmp_path, 20)
+
+
+def test_scan_workers_do_not_import_langchain(tmp_path, monkeypatch):
+    # Unpickling the scan function must not pull LangChain into each worker
+    _small_thresholds(monkeypatch)
+    _make_tree(tmp_path, 20)
+
+    assert _scan(tmp_path) == _expected(tmp_path, 20)
+    modules = code_tools._get_pool().submit(eval, "sorted(__import__('sys').modules)").result()
+    assert "langchain_agent.tools.scanning" in modules
+    assert not any(name.startswith(("langchain_core", "langchain_agent.tools.code_tools")) for name in modules)
+
+
+def test_first_pool_waits_for_a_large_tree(tmp_path, monkeypatch):
+    monkeypatch.setattr(code_tools, "PARALLEL_MIN_FILES", 4)
+    monkeypatch.setattr(code_tools, "PARALLEL_START_FILES", 40)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(code_tools, "_POOL", None)
+    _make_tree(tmp_path, 20)
+
+    assert _scan(tmp_path) == _expected(tmp_path, 20)
+    assert code_tools._POOL is None
+
+
+def test_broken_pool_falls_back_and_is_replaced(tmp_path, monkeypatch):
+    _small_thresholds(monkeypatch)
+    _make_tree(tmp_path, 20)
+
+    # A worker exiting abruptly, as when OOM-killed, breaks the pool
+    pool = code_tools._get_pool()
+    try:
+        pool.submit(os._exit, 1).result()
+    except Exception:
+        pass
+
+    assert _scan(tmp_path) == _expected(tmp_path, 20)
+    assert code_tools._POOL is not pool
+
+    # The next scan gets a working pool again
+    assert _scan(tmp_path) == _expected(tmp_path, 20)
+    assert code_tools._POOL is not None and code_tools._POOL is not pool
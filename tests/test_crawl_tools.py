@@ -0,0 +1,85 @@
+"""Tests for the shared crawler in langchain_agent.tools.crawl_tools.
+
+A stand-in crawler replaces crawl4ai's, so no browser is needed.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from langchain_agent.tools import crawl_tools
+
+
+class _FakeCrawler:
+    def __init__(self, arun):
+        self._arun = arun
+        self.closed = False
+
+    async def arun(self, url, **kwargs):
+        return await self._arun(url)
+
+    async def close(self):
+        self.closed = True
+
+
+async def _page(url):
+    return SimpleNamespace(success=True, markdown=f"content of {url}", title="T", error_message="")
+
+
+async def _browser_died(url):
+    raise RuntimeError("Browser has been closed")
+
+
+@pytest.fixture
+def shared_crawler(monkeypatch):
+    """Install a stand-in as the shared crawler and return a setter for it."""
+    def install(arun):
+        crawler = _FakeCrawler(arun)
+        monkeypatch.setattr(crawl_tools, "_CRAWLER", crawler)
+        return crawler
+    return install
+
+
+def test_crawl_uses_the_shared_crawler(shared_crawler):
+    crawler = shared_crawler(_page)
+
+    assert "content of http://a" in crawl_tools.crawl_webpage.invoke({"url": "http://a"})
+    assert crawl_tools._CRAWLER is crawler and not crawler.closed
+
+
+def test_crawler_that_raised_is_replaced(shared_crawler):
+    crawler = shared_crawler(_browser_died)
+
+    assert crawl_tools.crawl_webpage.invoke({"url": "http://a"}).startswith("Crawl error")
+    assert crawler.closed
+    assert crawl_tools._CRAWLER is None
+
+
+def test_bulk_crawl_replaces_crawler_that_raised(shared_crawler):
+    crawler = shared_crawler(_browser_died)
+
+    output = crawl_tools.crawl_bulk.invoke({"urls": ["http://a", "http://b"]})
+
+    assert output.count("Crawl error") == 2
+    assert crawler.closed
+    assert crawl_tools._CRAWLER is None
+
+
+def test_hung_crawl_times_out_and_is_cancelled(shared_crawler, monkeypatch):
+    started, cancelled = [], []
+
+    async def hang(url):
+        started.append(url)
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+
+    shared_crawler(hang)
+    monkeypatch.setattr(crawl_tools, "_CRAWL_TIMEOUT", 0.2)
+
+    assert crawl_tools.crawl_webpage.invoke({"url": "http://slow"}) == "Crawl error: timed out after 0.2s"
+    # The cancellation is delivered on the loop thread
+    crawl_tools._run_async(_page("http://next"))
+    assert started == cancelled == ["http://slow"]
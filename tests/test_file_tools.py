@@ -0,0 +1,111 @@
+"""Tests for the in-place edit tools in langchain_agent.tools.file_tools."""
+import os
+
+import pytest
+
+from langchain_agent.tools.file_tools import insert_in_file, replace_in_file
+
+
+def _replace(path, old_text, new_text):
+    return replace_in_file.invoke({"path": str(path), "old_text": old_text, "new_text": new_text})
+
+
+def _insert(path, content, line):
+    return insert_in_file.invoke({"path": str(path), "content": content, "line": line})
+
+
+def test_replace_keeps_content_and_mode(tmp_path):
+    target = tmp_path / "a.txt"
+    target.write_text("one\ntwo\nthree\n")
+    target.chmod(0o640)
+
+    assert _replace(target, "two", "2").startswith("Successfully")
+    assert target.read_text() == "one\n2\nthree\n"
+    assert target.stat().st_mode & 0o7777 == 0o640
+    # No temp files are left behind
+    assert os.listdir(tmp_path) == ["a.txt"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_replace_through_symlink_edits_target(tmp_path):
+    target = tmp_path / "real.txt"
+    target.write_text("a\nb\n")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target.name)
+
+    _replace(link, "b", "B")
+
+    assert link.is_symlink()
+    assert target.read_text() == "a\nB\n"
+
+
+def test_replace_keeps_hard_links(tmp_path):
+    first = tmp_path / "h1.txt"
+    first.write_text("x\ny\n")
+    second = tmp_path / "h2.txt"
+    os.link(first, second)
+
+    _replace(second, "y", "why")
+
+    assert os.path.samefile(first, second)
+    assert first.read_text() == "x\nwhy\n"
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() != 0, reason="needs root to chown")
+def test_replace_keeps_owner(tmp_path):
+    target = tmp_path / "owned.txt"
+    target.write_text("x")
+    os.chown(target, 65534, 65534)
+
+    _replace(target, "x", "y")
+
+    st = target.stat()
+    assert (st.st_uid, st.st_gid) == (65534, 65534)
+
+
+@pytest.mark.parametrize("line, expected", [
+    (1, "X\n1\n2\n"),
+    (2, "1\nX\n2\n"),
+    (3, "1\n2\nX\n"),
+    (-1, "1\n2\nX\n"),
+])
+def test_insert_positions(tmp_path, line, expected):
+    target = tmp_path / "a.txt"
+    target.write_text("1\n2\n")
+
+    assert _insert(target, "X", line).startswith("Successfully")
+    assert target.read_text() == expected
+
+
+def test_insert_out_of_range_leaves_file(tmp_path):
+    target = tmp_path / "a.txt"
+    target.write_text("1\n2\n")
+
+    assert _insert(target, "X", 5).startswith("Error")
+    assert target.read_text() == "1\n2\n"
+    assert os.listdir(tmp_path) == ["a.txt"]
+
+
+def test_insert_keeps_hard_links(tmp_path):
+    first = tmp_path / "h1.txt"
+    first.write_text("1\n2\n3\n")
+    second = tmp_path / "h2.txt"
+    os.link(first, second)
+
+    _insert(first, "X", 2)
+
+    assert os.path.samefile(first, second)
+    assert second.read_text() == "1\nX\n2\n3\n"
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_insert_through_symlink_edits_target(tmp_path):
+    target = tmp_path / "real.txt"
+    target.write_text("a\nb\n")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target.name)
+
+    _insert(link, "X", 1)
+
+    assert link.is_symlink()
+    assert target.read_text() == "X\na\nb\n"
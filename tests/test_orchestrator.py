@@ -0,0 +1,86 @@
+"""Tests for the query routing and helpers in leap_agent.orchestrator."""
+import pytest
+
+from leap_agent.config import LEAPConfig
+from leap_agent.orchestrator import LEAPOrchestrator, _estimate_json_chars, _route_intent
+
+
+@pytest.mark.parametrize("query, path", [
+    ("list files in src", "src"),
+    ("list the files in ~/projects", "~/projects"),
+    ("List directory of /tmp", "/tmp"),
+    ("list contents of leap_agent/tools", "leap_agent/tools"),
+    ("list files in docs?", "docs"),
+    ("list files .", "."),
+    ("list files ./src", "./src"),
+    ("list directory ~", "~"),
+    ("list files src/", "src/"),
+])
+def test_list_directory_routes_paths(query, path):
+    assert _route_intent(query) == {"tool": "list_directory", "params": {"path": path}}
+
+
+@pytest.mark.parametrize("query", [
+    "list directory contents",
+    "list files here",
+    "list files recursively",
+    "list files in here",
+    "list files in the current directory",
+    "list files in this folder",
+    "list files larger than 1MB",
+])
+def test_list_directory_leaves_non_paths_to_planner(query):
+    assert _route_intent(query) is None
+
+
+@pytest.mark.parametrize("query, expression", [
+    ("calculate 2 + 2", "2 + 2"),
+    ("compute (3*4)/2?", "(3*4)/2"),
+    ("Evaluate 10 % 3", "10 % 3"),
+])
+def test_calculate_routes_arithmetic(query, expression):
+    assert _route_intent(query) == {"tool": "calculate", "params": {"expression": expression}}
+
+
+@pytest.mark.parametrize("query", [
+    "what time is it?",
+    "What's the current date",
+    "current time",
+])
+def test_current_time_routes(query):
+    assert _route_intent(query) == {"tool": "current_time", "params": {}}
+
+
+@pytest.mark.parametrize("query", [
+    "calculate the area of a circle of radius 3",
+    "what time is it in Tokyo",
+    "search the web for python news",
+    "",
+])
+def test_other_queries_are_not_routed(query):
+    assert _route_intent(query) is None
+
+
+def _orchestrator(tool):
+    orchestrator = LEAPOrchestrator(LEAPConfig(warmup_models=False, verbose=False))
+    orchestrator.tools = {"big": tool}
+    return orchestrator
+
+
+def test_raw_size_counts_the_uncapped_result():
+    result = {"content": "x" * 100_000, "items": list(range(1000))}
+    orchestrator = _orchestrator(lambda: result)
+
+    orchestrator._phase2_execution({"tool": "big"})
+
+    assert orchestrator.metrics.raw_response_tokens == _estimate_json_chars(result) // 4
+    # The capped copy is what gets passed on
+    assert orchestrator.metrics.filtered_response_tokens < orchestrator.metrics.raw_response_tokens
+
+
+def test_raw_size_of_string_result():
+    orchestrator = _orchestrator(lambda: "y" * 40_000)
+
+    orchestrator._phase2_execution({"tool": "big"})
+
+    assert orchestrator.metrics.raw_response_tokens == 10_000
@@ -0,0 +1,144 @@
+"""Whole-file regex scans in grep_code must find exactly the lines a per-line search would.
+
+Both agents' grep_code search a file in one MULTILINE pass and re-check
+each candidate line, falling back to the line-by-line search for patterns
+where the two could differ. These tests compare them with the plain
+per-line search over anchors, lookarounds, classes that can cross a line
+break, CRLF, files without a trailing newline, and non-ASCII text, for
+ordinary files and for the memory-mapped bytes path used on files of
+MMAP_THRESHOLD bytes or more.
+"""
+import io
+import re
+
+import pytest
+
+from langchain_agent.tools import code_tools as lc_code_tools
+from langchain_agent.tools import scanning as lc_scanning
+from langchain_agent.tools.scanning import MMAP_THRESHOLD
+from leap_agent.tools import code_tools as leap_code_tools
+
+
+PATTERNS = [
+    r"def",
+    r"^def",
+    r"^\s*def",
+    r"pass$",
+    r"^$",
+    r"^",
+    r"$",
+    r"\Adef",
+    r"\Z",
+    r"x\b",
+    r"\Bef",
+    r"\bcaf\w",
+    r"\d+",
+    r"a.b",
+    r"def(?= )",
+    r"def(?!ine)",
+    r"(?<=\.)\w+",
+    r"(?<!_)name",
+    r"\s+",
+    r"\S+$",
+    r"x\s*=",
+    r"[^a-z]+",
+    r"[^\n]*",
+    r"pass\s*\n\s*def",
+    r"foo|^bar",
+    r"(?s)a.*b",
+    r"k",
+    r"strasse",
+    r"e?",
+    r"\t",
+    r"\r",
+]
+
+TEXTS = {
+    "plain": "def f():\n    pass\n\nx = 1\ndefine = x\n",
+    "no_trailing_newline": "x = 1\ndef g():\n    pass",
+    "crlf": "def f():\r\n    pass\r\n\r\nx = 1\r\n",
+    "old_mac": "def f():\r    pass\rx = 1\r",
+    "blank_lines": "\n\n\ndef h():\n\n    pass\n\n",
+    "lookarounds": "os.name\n_name = os.path\nname\nobj.attr_1\n",
+    "unicode": "café = 1\naéb\nK = 2\nSTRAſSE\n١٢ = 3\n",
+    "tabs_and_crossing": "bar\tfoo\na\nb\npass  \n  def x\nfoo bar\n",
+    "empty": "",
+    "single_newline": "\n",
+}
+
+
+def _per_line(text: str, regex: re.Pattern) -> list:
+    """The baseline: search each line as text-mode iteration yields it."""
+    return [(i, line) for i, line in enumerate(io.StringIO(text, newline=None), 1) if regex.search(line)]
+
+
+def _write(tmp_path, name: str, text: str):
+    path = tmp_path / name
+    # Bytes, so CRLF and lone CR reach the file as written
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+def _big(text: str) -> str:
+    """``text`` after enough ASCII filler lines to reach MMAP_THRESHOLD."""
+    filler = "# filler line for size\n" * (MMAP_THRESHOLD // 23 + 1)
+    return filler + text
+
+
+# leap_agent
+
+def _leap_grep(path, pattern: str) -> list:
+    line_re = re.compile(pattern)
+    scan_re = None if leap_code_tools._LINE_ONLY_RE.search(pattern) else re.compile(pattern, re.MULTILINE)
+    return [(m["line"], m["content"]) for m in leap_code_tools._grep_file(str(path), line_re, scan_re)]
+
+
+@pytest.mark.parametrize("name", TEXTS)
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_leap_scan_matches_per_line_search(tmp_path, pattern, name):
+    path = _write(tmp_path, "f.py", TEXTS[name])
+    expected = [(i, line.strip()[:100]) for i, line in _per_line(TEXTS[name], re.compile(pattern))]
+
+    assert _leap_grep(path, pattern) == expected[:leap_code_tools._GREP_LIMIT]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_leap_matching_lines_over_text(pattern):
+    # Whole-file scanning alone, without the file handling around it
+    if leap_code_tools._LINE_ONLY_RE.search(pattern):
+        pytest.skip("searched line by line")
+    line_re, scan_re = re.compile(pattern), re.compile(pattern, re.MULTILINE)
+    for text in TEXTS.values():
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        assert list(leap_code_tools._matching_lines(text, line_re, scan_re)) == _per_line(text, line_re)
+
+
+# langchain_agent
+
+def _lc_scan(path, pattern: str) -> list:
+    buffer_pattern = None if lc_code_tools._NEWLINE_CAPABLE.search(pattern) else pattern
+    matchers = lc_scanning.compile_scan(pattern, re.IGNORECASE, False, buffer_pattern)
+    return lc_scanning.scan_file(str(path), *matchers)
+
+
+def _lc_expected(text: str, pattern: str) -> list:
+    return [(i, line.strip()) for i, line in _per_line(text, re.compile(pattern, re.IGNORECASE))]
+
+
+@pytest.mark.parametrize("name", TEXTS)
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_langchain_scan_matches_per_line_search(tmp_path, pattern, name):
+    path = _write(tmp_path, "f.py", TEXTS[name])
+
+    assert _lc_scan(path, pattern) == _lc_expected(TEXTS[name], pattern)
+
+
+@pytest.mark.parametrize("name", ["plain", "no_trailing_newline", "crlf", "old_mac", "unicode", "tabs_and_crossing"])
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_langchain_mmap_scan_matches_per_line_search(tmp_path, pattern, name):
+    # Files this large take the memory-mapped bytes path when the pattern
+    # allows it; a bytes pattern's \w, \d, . and case folding are ASCII-only
+    text = _big(TEXTS[name])
+    path = _write(tmp_path, "big.py", text)
+
+    assert _lc_scan(path, pattern) == _lc_expected(text, pattern)
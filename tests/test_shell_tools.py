@@ -0,0 +1,29 @@
+"""Tests for run_command in langchain_agent.tools.shell_tools."""
+import os
+
+import pytest
+
+from langchain_agent.tools.shell_tools import run_command
+
+
+def _run(command: str) -> str:
+    return run_command.invoke({"command": command})
+
+
+def test_plain_command_runs_without_shell():
+    output = _run("echo hello")
+
+    assert "[OK] Success" in output
+    assert "hello" in output
+
+
+@pytest.mark.skipif(os.name != "posix", reason="needs sh")
+def test_script_without_shebang_runs_in_shell(tmp_path):
+    script = tmp_path / "noshebang"
+    script.write_text("echo from script\n")
+    script.chmod(0o755)
+
+    output = _run(str(script))
+
+    assert "[OK] Success" in output
+    assert "from script" in output
@@ -0,0 +1,108 @@
+"""Tests for calculate() in the langchain_agent and leap_agent utility tools."""
+import json
+
+import pytest
+
+from langchain_agent.tools.utility_tools import calculate
+from leap_agent.config import LEAPConfig
+from leap_agent.orchestrator import LEAPOrchestrator
+from leap_agent.tools import utility_tools as leap_utility_tools
+
+
+def _calc(expression: str) -> str:
+    return calculate.invoke({"expression": expression})
+
+
+@pytest.mark.parametrize("expression, result", [
+    ("2 + 3 * 4", "14"),
+    ("sqrt(16) + 1", "5.0"),
+    ("2 ** 10", "1024"),
+    ("2 ** -1", "0.5"),
+    ("pow(2, 10)", "1024"),
+    ("pow(7, 10 ** 9, 13)", "9"),
+    ("1 ** 10 ** 9", "1"),
+    ("[1, 2] * 2", "[1, 2, 1, 2]"),
+    ("sum([1, 2, 3])", "6"),
+    ("sum([[1], [2, 3]], [0])", "[0, 1, 2, 3]"),
+    ("(2 ** 4000) * (2 ** 4000)", str(2 ** 8000)),
+])
+def test_calculate_results(expression, result):
+    assert _calc(expression) == f"Result: {expression} = {result}"
+
+
+@pytest.mark.parametrize("expression", [
+    "(7 ** 9999) ** 9999",
+    "pow(pow(7, 9999), 9999)",
+    "(2 ** 9999) ** (2 ** 9999)",
+    "3 ** 10 ** 18",
+    "(2 ** 40000) * (2 ** 40000)",
+    "[0] * 10 ** 9",
+    "10 ** 9 * [0]",
+    "2 ** 20000",
+    "sum([[0] * 1000] * 2000, [])",
+    "sum([[0]] * 10 ** 6, [])",
+    "[[0] * 1000] * 2000",
+    "[0] * 600000 + [0] * 600000",
+])
+def test_calculate_refuses_huge_results(expression):
+    # These used to run for minutes or exhaust memory; now they fail at once
+    assert "too large" in _calc(expression)
+
+
+@pytest.mark.parametrize("expression", [
+    "().__class__",
+    "__import__('os')",
+    "'a' * 3",
+    "x + 1",
+])
+def test_calculate_rejects_non_math(expression):
+    assert _calc(expression).startswith("Error evaluating expression")
+
+
+@pytest.mark.parametrize("expression, result", [
+    ("2 + 3 * 4", 14),
+    ("len([1, 2, 3])", 3),
+    ("(1, 2) * 2", (1, 2, 1, 2)),
+    ("pow(7, 10 ** 9, 13)", 9),
+    ("sum([1, 2, 3])", 6),
+    ("sum([[1], [2, 3]], [0])", [0, 1, 2, 3]),
+    ("sum(((1,), (2,)), ())", (1, 2)),
+    ("len(sum([[0] * 1000] * 1000, []))", 1_000_000),
+])
+def test_leap_calculate_results(expression, result):
+    assert leap_utility_tools.calculate(expression)["result"] == result
+
+
+@pytest.mark.parametrize("expression", [
+    "(7 ** 9999) ** 9999",
+    "pow(pow(7, 9999), 9999)",
+    "3 ** 10 ** 18",
+    "(2 ** 40000) * (2 ** 40000)",
+    "[0] * 10 ** 9",
+    "(0,) * 10 ** 9",
+    "2 ** 20000",
+    "len(sum([[0] * 1000] * 3000, []))",
+    "len(sum([[0] * 4000] * 4000, []))",
+    "sum([[0]] * 10 ** 6, [])",
+    "[[0] * 1000] * 2000",
+    "[0] * 600000 + [0] * 600000",
+])
+def test_leap_calculate_refuses_huge_results(expression):
+    assert "too large" in leap_utility_tools.calculate(expression)["error"]
+
+
+def test_leap_calculate_sum_keeps_builtin_errors():
+    assert "can only concatenate tuple" in leap_utility_tools.calculate("sum([[1]], ())")["error"]
+
+
+def _execute_calculate(expression: str) -> dict:
+    orchestrator = LEAPOrchestrator(LEAPConfig(warmup_models=False, verbose=False))
+    orchestrator.tools = {"calculate": leap_utility_tools.calculate}
+    return json.loads(orchestrator._phase2_execution({"tool": "calculate", "params": {"expression": expression}}))
+
+
+def test_leap_big_results_pass_through_orchestrator():
+    # Integers past 4300 digits can't be converted to text, so the
+    # orchestrator used to fail serializing them
+    assert _execute_calculate("(2 ** 4000) * (2 ** 4000)")["result"] == 2 ** 8000
+    assert "too large" in _execute_calculate("2 ** 20000")["error"]
@@ -0,0 +1,66 @@
+"""Tests for fetch_url in leap_agent.tools.web_tools, over a mock HTTP transport."""
+import functools
+import gzip
+
+import httpx
+import pytest
+
+from leap_agent.tools import web_tools
+
+
+PAGE = "<html><head><script>var x = 1;</script></head><body><p>Café  au\nlait</p></body></html>"
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/moved":
+        return httpx.Response(301, headers={"Location": "/page"})
+    if request.url.path == "/page":
+        return httpx.Response(200, content=PAGE.encode("utf-8"))
+    if request.url.path == "/gzip":
+        return httpx.Response(200, headers={"Content-Encoding": "gzip"},
+                              content=gzip.compress(PAGE.encode("utf-8")))
+    if request.url.path == "/bad-bytes":
+        return httpx.Response(200, content=b"<p>ok \xff\xfe here</p>")
+    if request.url.path == "/agent":
+        return httpx.Response(200, content=request.headers["User-Agent"].encode())
+    return httpx.Response(404, content=b"not found")
+
+
+@pytest.fixture(autouse=True)
+def mock_transport(monkeypatch):
+    # The shared client is built as in production, just over the mock transport
+    web_tools._http_client.cache_clear()
+    monkeypatch.setattr(httpx, "Client", functools.partial(httpx.Client, transport=httpx.MockTransport(_handler)))
+    yield
+    web_tools._http_client.cache_clear()
+
+
+def test_fetch_extracts_page_text():
+    result = web_tools.fetch_url("http://example.test/page")
+
+    assert result == {"url": "http://example.test/page", "content": "Café au lait", "length": 12, "truncated": False}
+
+
+def test_fetch_follows_redirects():
+    assert web_tools.fetch_url("http://example.test/moved")["content"] == "Café au lait"
+
+
+def test_fetch_decodes_compressed_and_invalid_bytes():
+    assert web_tools.fetch_url("http://example.test/gzip")["content"] == "Café au lait"
+    # Bytes that aren't UTF-8 are dropped, as before
+    assert web_tools.fetch_url("http://example.test/bad-bytes")["content"] == "ok here"
+
+
+def test_fetch_client_error_returns_error_dict():
+    result = web_tools.fetch_url("http://example.test/missing")
+
+    assert set(result) == {"error", "url"}
+    assert "404" in result["error"]
+
+
+def test_fetch_truncates_and_reuses_client():
+    result = web_tools.fetch_url("http://example.test/page", max_length=4)
+
+    assert result["content"] == "Café" and result["truncated"] and result["length"] == 12
+    assert web_tools.fetch_url("http://example.test/agent")["content"] == "Mozilla/5.0"
+    assert web_tools._http_client.cache_info().currsize == 1